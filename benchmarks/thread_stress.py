@@ -0,0 +1,65 @@
+"""
+Renders calplots of one shared DataFrame from a growing number of threads,
+the way threaded web workers share a cached frame, and prints the renders
+per second of every thread count. Every render is checked against a single
+threaded one and the frame against a copy taken before the run.
+
+    python benchmarks/thread_stress.py --threads 1 2 4 8 --renders 32
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from plotly_calplot import calplot, month_calplot
+
+
+def get_shared_frame(years: int) -> pd.DataFrame:
+    dates = pd.date_range(end="2023-12-31", periods=365 * years)
+    return pd.DataFrame(
+        {
+            # string dates, so every render has to parse them
+            "ds": dates.strftime("%Y-%m-%d"),
+            "value": np.random.default_rng(0).random(len(dates)),
+        }
+    )
+
+
+def render(data: pd.DataFrame, index: int) -> str:
+    # both kinds, like a server drawing different views of the same data
+    if index % 2:
+        return str(month_calplot(data, "ds", "value").to_json())
+    return str(calplot(data, "ds", "value", space_between_plots=0.02).to_json())
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--renders", type=int, default=32)
+    parser.add_argument("--years", type=int, default=3)
+    args = parser.parse_args(arguments)
+
+    data = get_shared_frame(args.years)
+    original = data.copy()
+    expected = [render(original.copy(), index) for index in range(2)]
+
+    for threads in args.threads:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(
+                executor.map(lambda index: render(data, index), range(args.renders))
+            )
+        elapsed = time.perf_counter() - start
+        for index, result in enumerate(results):
+            assert result == expected[index % 2], f"render {index} differs"
+        print(f"{threads:>3} threads: {args.renders / elapsed:7.2f} renders/s")
+
+    pd.testing.assert_frame_equal(data, original)
+    print("shared frame unchanged")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,64 @@
-from .calplot import calplot, month_calplot
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-__version__ = "0.0.2"
+from .calplot import (
+    calplot,
+    entity_calplot,
+    image_calplot,
+    month_calplot,
+    window_calplot,
+)
+from .cost import CostBudget, FigureCost, check_figure_cost, get_figure_cost
+from .html_bundle import figures_to_html, write_html_bundle
+from .patch import get_figure_patch
+from .serialization import (
+    get_input_hash,
+    to_canonical_json,
+    to_json_bytes,
+    write_figure_json,
+)
+
+if TYPE_CHECKING:
+    from .paging import PreparedCalplot, prepare_calplot
+    from .store import DailyStore
+
+# keep in sync with the version in pyproject.toml
+__version__ = "0.1.20"
 
 __all__ = [
     "calplot",
+    "entity_calplot",
+    "image_calplot",
     "month_calplot",
+    "window_calplot",
+    "CostBudget",
+    "FigureCost",
+    "check_figure_cost",
+    "get_figure_cost",
+    "figures_to_html",
+    "write_html_bundle",
+    "get_figure_patch",
+    "get_input_hash",
+    "to_canonical_json",
+    "to_json_bytes",
+    "write_figure_json",
+    "DailyStore",
+    "PreparedCalplot",
+    "prepare_calplot",
 ]
+
+# names whose modules need numpy or pandas at import time, they are only
+# imported on first access to keep `import plotly_calplot` cheap
+_LAZY_ATTRIBUTES = {
+    "DailyStore": ".store",
+    "PreparedCalplot": ".paging",
+    "prepare_calplot": ".paging",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,5 @@
+import sys
+
+from plotly_calplot.cli import main
+
+sys.exit(main())
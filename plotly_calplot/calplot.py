@@ -1,23 +1,25 @@
+from __future__ import annotations
+
 from datetime import date
-from typing import Any, Dict, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union, cast
 
-import numpy as np
-from pandas import DataFrame, Grouper, Series
-from plotly import graph_objects as go
-from plotly.subplots import make_subplots
+# pandas, numpy and plotly are only imported when a plot is actually built,
+# so that `import plotly_calplot` stays cheap for callers that never draw
+if TYPE_CHECKING:
+    from pandas import DataFrame, Series
+    from plotly import graph_objects as go
 
-from plotly_calplot.layout_formatter import (
-    apply_general_colorscaling,
-    showscale_of_heatmaps,
-)
-from plotly_calplot.single_year_calplot import year_calplot
-from plotly_calplot.utils import fill_empty_with_zeros, validate_date_column
+    from plotly_calplot.cost import CostBudget
+    from plotly_calplot.paging import PreparedCalplot
+    from plotly_calplot.streaming import CalplotSource, FrameSource
 
 
 def _get_subplot_layout(**kwargs: Any) -> go.Layout:
     """
     Combines the default subplot layout with the customized parameters
     """
+    from plotly import graph_objects as go
+
     dark_theme: bool = kwargs.pop("dark_theme", False)
     yaxis: Dict[str, Any] = kwargs.pop("yaxis", {})
     xaxis: Dict[str, Any] = kwargs.pop("xaxis", {})
@@ -53,9 +55,9 @@ def _get_subplot_layout(**kwargs: Any) -> go.Layout:
 
 
 def calplot(
-    data: DataFrame,
-    x: str,
-    y: str,
+    data: CalplotSource,
+    x: str = "x",
+    y: str = "y",
     name: str = "y",
     dark_theme: bool = False,
     month_lines_width: int = 1,
@@ -75,20 +77,32 @@ def calplot(
     start_month: int = 1,
     end_month: int = 12,
     date_fmt: str = "%Y-%m-%d",
+    date_unit: Optional[str] = None,
+    dedupe_dates: bool = False,
+    sparse: bool = False,
+    chunksize: int = 1_000_000,
+    cost_budget: Optional[CostBudget] = None,
+    n_jobs: int = 1,
 ) -> go.Figure:
     """
     Yearly Calendar Heatmap
 
     Parameters
     ----------
-    data : DataFrame
+    data : DataFrame | Series | (dates, values) | str | PathLike | Iterable[DataFrame]
         Must contain at least one date like column and
-        one value column for displaying in the plot
+        one value column for displaying in the plot.
+        A Series indexed by date, or a pair of date and value arrays, is
+        placed on the calendar directly when its dates are sorted, unique
+        and daily, skipping the validation and merges.
+        A path to a CSV or Parquet file, or an iterable of DataFrame
+        chunks, is read one chunk at a time and reduced to daily sums
+        so it doesn't have to fit in memory
 
-    x : str
+    x : str = "x"
         The name of the date like column in data
 
-    y : str
+    y : str = "y"
         The name of the value column in data
 
     dark_theme : bool = False
@@ -155,12 +169,119 @@ def calplot(
         date format for the date column in data, defaults to "%Y-%m-%d"
         If the date column is already in datetime format, this parameter
         will be ignored.
+
+    date_unit : str = None
+        epoch unit ("s", "ms", "us" or "ns") of a numeric date column,
+        numeric date columns are only accepted when it is provided
+
+    dedupe_dates : bool = False
+        if True string dates are parsed once per distinct value, which is
+        much faster for long logs with few distinct dates
+
+    sparse : bool = False
+        if True only the days present in data are sent to the heatmaps,
+        drawn over a single colored grid of the whole calendar. Much
+        lighter for calendars where most days have no data
+
+    chunksize : int = 1_000_000
+        rows per chunk when data is a path to a CSV or Parquet file
+
+    cost_budget : CostBudget = None
+        if provided, the figure is measured with get_figure_cost and a
+        warning is emitted, or an error raised, when it goes over the
+        budget. The measured cost is kept in fig.layout.meta["cost"]
+
+    n_jobs : int = 1
+        number of worker processes the years are built in, -1 for one per
+        CPU. Each worker only receives the data of the years it builds,
+        which pays off for histories of several decades
+    """
+    from plotly_calplot.paging import prepare_calplot
+
+    prepared = prepare_calplot(
+        data,
+        x,
+        y,
+        text=text,
+        start_month=start_month,
+        end_month=end_month,
+        date_fmt=date_fmt,
+        date_unit=date_unit,
+        dedupe_dates=dedupe_dates,
+        chunksize=chunksize,
+    )
+    return _render_calplot(
+        prepared,
+        prepared.year_slices,
+        name=name,
+        dark_theme=dark_theme,
+        month_lines_width=month_lines_width,
+        month_lines_color=month_lines_color,
+        gap=gap,
+        years_title=years_title,
+        colorscale=colorscale,
+        title=title,
+        month_lines=month_lines,
+        total_height=total_height,
+        space_between_plots=space_between_plots,
+        showscale=showscale,
+        years_as_columns=years_as_columns,
+        cmap_min=cmap_min,
+        cmap_max=cmap_max,
+        sparse=sparse,
+        cost_budget=cost_budget,
+        n_jobs=n_jobs,
+    )
+
+
+def _render_calplot(
+    prepared: PreparedCalplot,
+    year_slices: List[Tuple[int, slice]],
+    name: str = "y",
+    dark_theme: bool = False,
+    month_lines_width: int = 1,
+    month_lines_color: str = "#9e9e9e",
+    gap: int = 1,
+    years_title: bool = False,
+    colorscale: str = "greens",
+    title: str = "",
+    month_lines: bool = True,
+    total_height: Union[int, None] = None,
+    space_between_plots: float = 0.08,
+    showscale: bool = False,
+    years_as_columns: bool = False,
+    cmap_min: Optional[float] = None,
+    cmap_max: Optional[float] = None,
+    sparse: bool = False,
+    cost_budget: Optional[CostBudget] = None,
+    n_jobs: int = 1,
+) -> go.Figure:
     """
-    data[x] = validate_date_column(data[x], date_fmt)
-    unique_years = data[x].dt.year.unique()
+    Builds the calplot of the given years of prepared data, the options are
+    the ones of calplot
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+
+    from plotly.subplots import make_subplots
+
+    from plotly_calplot.cost import apply_cost_budget
+    from plotly_calplot.layout_formatter import (
+        COLORAXIS,
+        add_year_payloads,
+        apply_coloraxis,
+        apply_shared_layout,
+        decide_layout,
+    )
+
+    x, y, text = prepared.x, prepared.y, prepared.text
+    days, columns = prepared.days, prepared.columns
+    start_month, end_month = prepared.start_month, prepared.end_month
+
+    unique_years = [year for year, _ in year_slices]
     unique_years_amount = len(unique_years)
     if years_title:
-        subplot_titles = unique_years.astype(str)
+        subplot_titles = [str(year) for year in unique_years]
     else:
         subplot_titles = None
 
@@ -188,53 +309,117 @@ def calplot(
 
     # getting cmap_min and cmap_max
     if cmap_min is None:
-        cmap_min = data[y].min()
+        cmap_min = prepared.value_min
 
     if cmap_max is None:
-        cmap_max = data[y].max()
+        cmap_max = prepared.value_max
 
-    data = data[
-        data[x].dt.month.isin(np.arange(start_month, end_month + 1, 1).tolist())
+    year_options = dict(
+        name=name,
+        dark_theme=dark_theme,
+        month_lines_width=month_lines_width,
+        month_lines_color=month_lines_color,
+        gap=gap,
+        colorscale=colorscale,
+        title=title,
+        month_lines=month_lines,
+        start_month=start_month,
+        end_month=end_month,
+        sparse=sparse,
+        coloraxis=COLORAXIS,
+    )
+    # every per year array is a view on the sorted columns, so a task holds
+    # only its own year's days and values
+    tasks = [
+        (
+            year,
+            days[year_slice],
+            {column: values[year_slice] for column, values in columns.items()},
+            x,
+            y,
+            text,
+            prepared.unique_days,
+            year_options,
+        )
+        for year, year_slice in year_slices
     ]
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as executor:
+            payloads = list(executor.map(_get_year_payload, tasks))
+    else:
+        payloads = [_get_year_payload(task) for task in tasks]
+    fig = add_year_payloads(fig, payloads)
 
-    for i, year in enumerate(unique_years):
-        selected_year_data = data.loc[data[x].dt.year == year]
-        selected_year_data = fill_empty_with_zeros(
-            selected_year_data, x, year, start_month, end_month
-        )
+    # the axes were set per year, the rest of the layout is the same for all
+    shared_layout = decide_layout(dark_theme, title, [], [])
+    fig = apply_shared_layout(fig, shared_layout, total_height)
+    # every heatmap references the same coloraxis, so the color settings are
+    # stored once instead of once per year
+    fig = apply_coloraxis(fig, colorscale, cmap_min, cmap_max, showscale)
+    return apply_cost_budget(fig, cost_budget)
+
+
+def _get_year_traces(
+    year: int,
+    days: Any,
+    columns: Dict[str, Any],
+    x: str,
+    y: str,
+    text: Optional[str],
+    unique_days: bool,
+    year_options: Dict[str, Any],
+) -> Tuple[List[go.Figure], go.Layout]:
+    """
+    The traces and subplot layout of one year of a calplot, from that
+    year's days and columns
+    """
+    from pandas import DataFrame
+
+    from plotly_calplot.single_year_calplot import get_year_traces
+    from plotly_calplot.utils import fill_year_frame
 
-        year_calplot(
-            selected_year_data,
+    if year_options["sparse"]:
+        year_data = DataFrame({x: days.astype("datetime64[ns]"), **columns})
+    else:
+        year_data = fill_year_frame(
+            days,
+            columns,
             x,
-            y,
-            name=name,
-            month_lines=month_lines,
-            month_lines_width=month_lines_width,
-            month_lines_color=month_lines_color,
-            colorscale=colorscale,
-            year=year,
-            fig=fig,
-            dark_theme=dark_theme,
-            gap=gap,
-            title=title,
-            row=i,
-            total_height=total_height,
-            text=None if text is None else selected_year_data[text].tolist(),
-            text_name=text,
-            years_as_columns=years_as_columns,
-            start_month=start_month,
-            end_month=end_month,
+            year,
+            year_options["start_month"],
+            year_options["end_month"],
+            unique=unique_days,
         )
+    return get_year_traces(
+        year_data,
+        x,
+        y,
+        year,
+        text=None if text is None else year_data[text].tolist(),
+        text_name=text,
+        **year_options,
+    )
 
-    fig = apply_general_colorscaling(fig, cmap_min, cmap_max)
-    if showscale:
-        fig = showscale_of_heatmaps(fig)
 
-    return fig
+def _get_year_payload(
+    task: Tuple[Any, ...]
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    _get_year_traces as plain dicts, the traces and the axes of the year,
+    which are cheaper than graph objects to send back from a worker process
+    """
+    cplt, layout = _get_year_traces(*task)
+    axes = {
+        "xaxis": layout.xaxis.to_plotly_json(),
+        "yaxis": layout.yaxis.to_plotly_json(),
+    }
+    return [trace.to_plotly_json() for trace in cplt], axes
 
 
 def month_calplot(
-    data: DataFrame = None,
+    data: Optional[FrameSource] = None,
     x: str = "x",
     y: str = "y",
     name: str = "y",
@@ -246,16 +431,22 @@ def month_calplot(
     total_height: Union[int, None] = None,
     showscale: bool = False,
     date_fmt: str = "%Y-%m-%d",
+    date_unit: Optional[str] = None,
+    dedupe_dates: bool = False,
+    chunksize: int = 1_000_000,
+    cost_budget: Optional[CostBudget] = None,
+    group: Optional[str] = None,
 ) -> go.Figure:
     """
     Yearly Calendar Heatmap by months (12 cols per row)
 
     Parameters
     ----------
-    data : DataFrame | None
+    data : DataFrame | str | PathLike | Iterable[DataFrame] | None
         Must contain at least one date like column and
         one value column for displaying in the plot. If data is None, x and y will
-        be used
+        be used. A path to a CSV or Parquet file, or an iterable of DataFrame
+        chunks, is read one chunk at a time and reduced to daily sums
 
     x : str | Iterable
         The name of the date like column in data or the column if data is None
@@ -278,7 +469,8 @@ def month_calplot(
         title of the plot
 
     year_height: int = 30
-        the height per year to be used if total_height is None
+        the height per year, or per group when group is given, to be used
+        if total_height is None
 
     total_height : int = None
         if provided a value, will force the plot to have a specific
@@ -292,22 +484,73 @@ def month_calplot(
         date format for the date column in data, defaults to "%Y-%m-%d"
         If the date column is already in datetime format, this parameter
         will be ignored.
+
+    date_unit : str = None
+        epoch unit ("s", "ms", "us" or "ns") of a numeric date column,
+        numeric date columns are only accepted when it is provided
+
+    dedupe_dates : bool = False
+        if True string dates are parsed once per distinct value, which is
+        much faster for long logs with few distinct dates
+
+    chunksize : int = 1_000_000
+        rows per chunk when data is a path to a CSV or Parquet file
+
+    cost_budget : CostBudget = None
+        if provided, the figure is measured with get_figure_cost and a
+        warning is emitted, or an error raised, when it goes over the
+        budget. The measured cost is kept in fig.layout.meta["cost"]
+
+    group : str = None
+        the name of a column in data identifying series, if provided
+        every series gets a row with one column per month, from the first
+        to the last month with data, in a single heatmap
     """
+    from pandas import DataFrame, Grouper, Series
+    from plotly import graph_objects as go
+
+    from plotly_calplot.cost import apply_cost_budget
+    from plotly_calplot.streaming import as_frame
+    from plotly_calplot.utils import validate_date_column
+
     if data is None:
-        if not isinstance(x, Series):
-            x = Series(x, dtype="datetime64[ns]", name="x")
+        # x and y hold the columns themselves
+        x_column: Series[Any] = (
+            x if isinstance(x, Series) else Series(x, dtype="datetime64[ns]", name="x")
+        )
+        y_column: Series[Any] = (
+            y if isinstance(y, Series) else Series(y, dtype="float64", name="y")
+        )
 
-        if not isinstance(y, Series):
-            y = Series(y, dtype="float64", name="y")
+        data = DataFrame({x_column.name: x_column, y_column.name: y_column})
 
-        data = DataFrame({x.name: x, y.name: y})
+        x = cast(str, x_column.name)
+        y = cast(str, y_column.name)
+    else:
+        if group is not None and not isinstance(data, DataFrame):
+            raise ValueError("group can't be used when data is read in chunks")
+        data = as_frame(data, x, y, date_fmt, date_unit, dedupe_dates, chunksize)
 
-        x = x.name
-        y = y.name
+    # data is only read, the parsed dates are kept apart from it
+    dates = validate_date_column(data[x], date_fmt, date_unit, dedupe=dedupe_dates)
 
-    data[x] = validate_date_column(data[x], date_fmt)
+    if group is not None:
+        fig = _group_month_calplot(
+            data,
+            dates,
+            y,
+            group,
+            dark_theme=dark_theme,
+            gap=gap,
+            colorscale=colorscale,
+            title=title,
+            row_height=year_height,
+            total_height=total_height,
+            showscale=showscale,
+        )
+        return apply_cost_budget(fig, cost_budget)
 
-    gData = data.set_index(x)[y].groupby(Grouper(freq="M")).sum()
+    gData = Series(data[y].to_numpy(), index=dates).groupby(Grouper(freq="M")).sum()
     unique_years = gData.index.year.unique()
     unique_years_amount = len(unique_years)
 
@@ -345,5 +588,654 @@ def month_calplot(
     )
 
     fig = go.Figure(data=cplt, layout=layout)
+    return apply_cost_budget(fig, cost_budget)
+
+
+def _group_month_calplot(
+    data: DataFrame,
+    dates: Series[Any],
+    y: str,
+    group: str,
+    dark_theme: bool,
+    gap: int,
+    colorscale: str,
+    title: str,
+    row_height: int,
+    total_height: Optional[int],
+    showscale: bool,
+) -> go.Figure:
+    """
+    Month by series heatmap of month_calplot, the sums of every series and
+    month come from a single bincount instead of a loop over the series
+    """
+    import numpy as np
+    import pandas as pd
+    from plotly import graph_objects as go
+
+    from plotly_calplot.date_extractors import MONTH_NAMES
+    from plotly_calplot.utils import get_entity_month_matrix
+
+    entity_codes, entities = pd.factorize(data[group], sort=True)
+    matrix, months = get_entity_month_matrix(
+        entity_codes,
+        dates.to_numpy().astype("datetime64[M]"),
+        data[y].to_numpy(dtype=float),
+        len(entities),
+    )
+    month_ordinals = months.astype(np.int64).tolist()
+    month_labels = [
+        f"{MONTH_NAMES[m % 12][:3]} {1970 + m // 12}" for m in month_ordinals
+    ]
+
+    if total_height is None:
+        total_height = 20 + max(10, row_height * len(entities))
+
+    layout = _get_subplot_layout(
+        dark_theme=dark_theme,
+        height=total_height,
+        title=title,
+        yaxis={"tickmode": "auto"},
+        xaxis={"tickmode": "auto", "tickangle": 45},
+    )
+    heatmap = go.Heatmap(
+        x=month_labels,
+        y=[str(entity_name) for entity_name in entities],
+        z=matrix,
+        name=title,
+        showscale=showscale,
+        xgap=gap,
+        ygap=gap,
+        colorscale=colorscale,
+        hoverongaps=False,
+        hovertemplate="%{y}<br>%{x}: %{z:.0f}<extra></extra>",
+    )
+    return go.Figure(data=heatmap, layout=layout)
+
+
+def image_calplot(
+    data: DataFrame,
+    x: str,
+    y: str,
+    name: str = "y",
+    dark_theme: bool = False,
+    colorscale: Any = "greens",
+    title: str = "",
+    total_height: Union[int, None] = None,
+    cmap_min: Optional[float] = None,
+    cmap_max: Optional[float] = None,
+    start_month: int = 1,
+    end_month: int = 12,
+    hover: bool = False,
+    date_fmt: str = "%Y-%m-%d",
+    date_unit: Optional[str] = None,
+    cost_budget: Optional[CostBudget] = None,
+) -> go.Figure:
+    """
+    Yearly Calendar Heatmap pre-rendered as a single image
+
+    The values are colored in NumPy and laid out on the same week x weekday
+    grid as calplot, with every year stacked in one go.Image trace. The
+    browser then draws one picture no matter how many days there are,
+    which suits very large calendars that don't need interaction.
+
+    Parameters
+    ----------
+    data : DataFrame
+        Must contain at least one date like column and
+        one value column for displaying in the plot
+
+    x : str
+        The name of the date like column in data
+
+    y : str
+        The name of the value column in data
+
+    name : str = "y"
+        name of the values shown in the hover text
+
+    dark_theme : bool = False
+        Option for creating a dark themed plot
+
+    colorscale : str = "greens"
+        controls the colorscale for the calendar, works
+        with all the standard Plotly Colorscales and also
+        supports custom colorscales made by the user
+
+    title : str = ""
+        title of the plot
+
+    total_height : int = None
+        if provided a value, will force the plot to have a specific
+        height, otherwise the total height will be calculated
+        according to the amount of years in data
+
+    cmap_min : float = None
+        colomap min, defaults to min value of the data
+
+    cmap_max : float = None
+        colomap max, defaults to max value of the data
+
+    start_month : int = 1
+        starting month range to plot, defaults to 1 (January)
+
+    end_month : int = 12
+        ending month range to plot, defaults to 12 (December)
+
+    hover : bool = False
+        if True the image is sent as pixel arrays with a hover text per
+        day, otherwise it is sent as a compressed PNG without hover
+
+    date_fmt : str = "%Y-%m-%d"
+        date format for the date column in data, defaults to "%Y-%m-%d"
+        If the date column is already in datetime format, this parameter
+        will be ignored.
+
+    date_unit : str = None
+        epoch unit ("s", "ms", "us" or "ns") of a numeric date column,
+        numeric date columns are only accepted when it is provided
+
+    cost_budget : CostBudget = None
+        if provided, the figure is measured with get_figure_cost and a
+        warning is emitted, or an error raised, when it goes over the
+        budget. The measured cost is kept in fig.layout.meta["cost"]
+    """
+    import numpy as np
+    from plotly import graph_objects as go
+
+    from plotly_calplot.cost import apply_cost_budget
+    from plotly_calplot.date_extractors import MONTH_NAMES
+    from plotly_calplot.raster import (
+        YEAR_ROWS,
+        encode_png,
+        get_colorscale_lut,
+        get_hovertext,
+        map_values_to_rgba,
+        rasterize_calendar,
+    )
+    from plotly_calplot.utils import validate_date_column
+
+    dates = validate_date_column(data[x], date_fmt, date_unit).to_numpy()
+    values = data[y].to_numpy(dtype=float)
+    # without any value every pixel is transparent and the limits don't matter
+    finite_values = values[np.isfinite(values)]
+    if cmap_min is None:
+        cmap_min = float(finite_values.min()) if len(finite_values) else 0.0
+    if cmap_max is None:
+        cmap_max = float(finite_values.max()) if len(finite_values) else 0.0
+
+    value_grid, date_grid, years = rasterize_calendar(
+        dates, values, start_month, end_month
+    )
+    rgba = map_values_to_rgba(
+        value_grid, get_colorscale_lut(colorscale), cmap_min, cmap_max
+    )
+
+    image_kwargs: Dict[str, Any] = {"x0": 0, "dx": 1, "y0": 0, "dy": 1, "name": name}
+    if hover:
+        image = go.Image(
+            z=rgba,
+            colormodel="rgba",
+            zmax=[255, 255, 255, 255],
+            hovertext=get_hovertext(value_grid, date_grid, name),
+            hoverinfo="text",
+            **image_kwargs,
+        )
+    else:
+        image = go.Image(source=encode_png(rgba), hoverinfo="skip", **image_kwargs)
+
+    if total_height is None:
+        total_height = 150 * max(len(years), 1)
+
+    months = range(start_month, end_month + 1)
+    month_positions = np.linspace(1.5, 50, 12)[[m - 1 for m in months]]
+    layout = _get_subplot_layout(
+        dark_theme=dark_theme,
+        height=total_height,
+        title=title,
+        yaxis={
+            "tickvals": [i * YEAR_ROWS + 3 for i in range(len(years))],
+            "ticktext": [str(year) for year in years],
+        },
+        xaxis={
+            "tickvals": month_positions,
+            "ticktext": [MONTH_NAMES[m - 1] for m in months],
+        },
+    )
+    return apply_cost_budget(go.Figure(data=image, layout=layout), cost_budget)
+
+
+def entity_calplot(
+    data: DataFrame,
+    x: str,
+    y: str,
+    entity: str,
+    year: Optional[int] = None,
+    name: str = "y",
+    dark_theme: bool = False,
+    month_lines_width: int = 1,
+    month_lines_color: str = "#9e9e9e",
+    gap: int = 1,
+    colorscale: str = "greens",
+    title: str = "",
+    month_lines: bool = True,
+    entity_height: int = 100,
+    total_height: Union[int, None] = None,
+    showscale: bool = False,
+    cmap_min: Optional[float] = None,
+    cmap_max: Optional[float] = None,
+    start_month: int = 1,
+    end_month: int = 12,
+    single_trace: bool = False,
+    date_fmt: str = "%Y-%m-%d",
+    date_unit: Optional[str] = None,
+    cost_budget: Optional[CostBudget] = None,
+) -> go.Figure:
+    """
+    Calendar Heatmap of one year for many series, one calendar row per entity
+
+    The week x weekday geometry of the year is computed once and every
+    entity gets its values placed on it by day offset, so the figure holds
+    one heatmap per entity (or a single one) on a single pair of axes.
+
+    Parameters
+    ----------
+    data : DataFrame
+        Must contain one date like column, one value column and
+        one entity column, in long format
+
+    x : str
+        The name of the date like column in data
+
+    y : str
+        The name of the value column in data
+
+    entity : str
+        The name of the column identifying the series of each row
+
+    year : int = None
+        the year to plot, defaults to the latest year in data
+
+    name : str = "y"
+        name of the values shown in the hover text
+
+    dark_theme : bool = False
+        Option for creating a dark themed plot
+
+    month_lines_width : int = 1
+        if month_lines this option controls the width of
+        the line between each month in the calendar
+
+    month_lines_color : str = "#9e9e9e"
+        if month_lines this option controls the color of
+        the line between each month in the calendar
+
+    gap : int = 1
+        controls the gap bewteen daily squares
+
+    colorscale : str = "greens"
+        controls the colorscale for the calendar, works
+        with all the standard Plotly Colorscales and also
+        supports custom colorscales made by the user
+
+    title : str = ""
+        title of the plot
+
+    month_lines: bool = True
+        if true will plot a separation line between
+        each month in the calendar
+
+    entity_height : int = 100
+        the height per entity to be used if total_height is None
+
+    total_height : int = None
+        if provided a value, will force the plot to have a specific
+        height, otherwise the total height will be calculated
+        according to the amount of entities in data
+
+    showscale : bool = False
+        if True, a color legend will be created.
+
+    cmap_min : float = None
+        colomap min, defaults to min value of the plotted year
+
+    cmap_max : float = None
+        colomap max, defaults to max value of the plotted year
+
+    start_month : int = 1
+        starting month range to plot, defaults to 1 (January)
+
+    end_month : int = 12
+        ending month range to plot, defaults to 12 (December)
+
+    single_trace : bool = False
+        if True every entity goes to one heatmap instead of
+        one heatmap per entity
+
+    date_fmt : str = "%Y-%m-%d"
+        date format for the date column in data, defaults to "%Y-%m-%d"
+        If the date column is already in datetime format, this parameter
+        will be ignored.
+
+    date_unit : str = None
+        epoch unit ("s", "ms", "us" or "ns") of a numeric date column,
+        numeric date columns are only accepted when it is provided
+
+    cost_budget : CostBudget = None
+        if provided, the figure is measured with get_figure_cost and a
+        warning is emitted, or an error raised, when it goes over the
+        budget. The measured cost is kept in fig.layout.meta["cost"]
+    """
+    import numpy as np
+    import pandas as pd
+    from plotly import graph_objects as go
+
+    from plotly_calplot.cost import apply_cost_budget
+    from plotly_calplot.date_extractors import MONTH_NAMES, get_vectorized_date_parts
+    from plotly_calplot.layout_formatter import (
+        COLORAXIS,
+        apply_coloraxis,
+        create_month_lines_trace,
+        get_month_lines_path,
+    )
+    from plotly_calplot.raster import YEAR_ROWS
+    from plotly_calplot.utils import (
+        get_entity_day_matrix,
+        get_year_date_range,
+        validate_date_column,
+    )
+
+    dates = validate_date_column(data[x], date_fmt, date_unit)
+    if year is None:
+        year = int(dates.dt.year.max())
+
+    # the geometry of the year is shared by every entity
+    calendar = get_year_date_range(year, start_month, end_month)
+    calendar_days = calendar.values.astype("datetime64[D]")
+    _, _, weekdays, weeknumbers = get_vectorized_date_parts(calendar_days)
+    date_strings = np.datetime_as_string(calendar_days, unit="D")
+
+    entity_codes, entities = pd.factorize(data[entity], sort=True)
+    matrix = get_entity_day_matrix(
+        entity_codes,
+        dates.to_numpy().astype("datetime64[D]"),
+        data[y].to_numpy(dtype=float),
+        len(entities),
+        calendar,
+    )
+    if cmap_min is None:
+        cmap_min = float(np.nanmin(matrix))
+    if cmap_max is None:
+        cmap_max = float(np.nanmax(matrix))
+
+    row_offsets = np.arange(len(entities)) * YEAR_ROWS
+    heatmap_kwargs: Dict[str, Any] = dict(
+        xgap=gap,
+        ygap=gap,
+        coloraxis=COLORAXIS,
+        hovertemplate="%{customdata} <br>Week=%{x} <br>" + name + "=%{z}",
+    )
+    if single_trace:
+        # a grid rather than x/y/z columns, the empty rows between entities
+        # would otherwise stretch the neighbouring cells
+        rows = (row_offsets[:, None] + weekdays[None, :]).ravel()
+        columns = np.tile(weeknumbers, len(entities))
+        shape = (max(len(entities) * YEAR_ROWS - 1, 0), weeknumbers.max() + 1)
+        z = np.full(shape, np.nan)
+        z[rows, columns] = matrix.ravel()
+        customdata = np.full(shape, "", dtype=object)
+        customdata[rows, columns] = np.tile(date_strings, len(entities))
+        traces = [
+            go.Heatmap(
+                z=z,
+                customdata=customdata,
+                name=name,
+                hoverongaps=False,
+                **heatmap_kwargs,
+            )
+        ]
+    else:
+        traces = [
+            go.Heatmap(
+                x=weeknumbers,
+                y=weekdays + offset,
+                z=values,
+                customdata=date_strings,
+                name=str(entity_name),
+                **heatmap_kwargs,
+            )
+            for entity_name, offset, values in zip(entities, row_offsets, matrix)
+        ]
+
+    if month_lines:
+        xs, ys = get_month_lines_path(calendar_days, weekdays, weeknumbers, row_offsets)
+        traces.append(
+            create_month_lines_trace(month_lines_color, month_lines_width, xs, ys)
+        )
+
+    if total_height is None:
+        total_height = 20 + entity_height * len(entities)
+
+    months = range(start_month, end_month + 1)
+    layout = _get_subplot_layout(
+        dark_theme=dark_theme,
+        height=total_height,
+        title=title,
+        yaxis={
+            "tickvals": row_offsets + 3,
+            "ticktext": [str(entity_name) for entity_name in entities],
+        },
+        xaxis={
+            "tickvals": np.linspace(1.5, 50, 12)[[m - 1 for m in months]],
+            "ticktext": [MONTH_NAMES[m - 1] for m in months],
+        },
+    )
+    fig = go.Figure(data=traces, layout=layout)
+    fig = apply_coloraxis(fig, colorscale, cmap_min, cmap_max, showscale)
+    return apply_cost_budget(fig, cost_budget)
+
+
+def window_calplot(
+    data: CalplotSource,
+    x: str = "x",
+    y: str = "y",
+    end: Any = None,
+    days: int = 365,
+    name: str = "y",
+    dark_theme: bool = False,
+    month_lines_width: int = 1,
+    month_lines_color: str = "#9e9e9e",
+    gap: int = 1,
+    colorscale: str = "greens",
+    title: str = "",
+    month_lines: bool = True,
+    total_height: int = 150,
+    showscale: bool = False,
+    text: Optional[str] = None,
+    cmap_min: Optional[float] = None,
+    cmap_max: Optional[float] = None,
+    date_fmt: str = "%Y-%m-%d",
+    date_unit: Optional[str] = None,
+    dedupe_dates: bool = False,
+    chunksize: int = 1_000_000,
+    cost_budget: Optional[CostBudget] = None,
+) -> go.Figure:
+    """
+    Calendar Heatmap of a trailing window of days, like the last 365 days
+
+    The window is laid out as one continuous week x weekday grid, even
+    when it crosses a year boundary, and drawn with a single heatmap and a
+    single trace of month lines instead of one padded calendar per year.
+
+    Parameters
+    ----------
+    data : DataFrame | Series | (dates, values) | str | PathLike | Iterable[DataFrame]
+        Same as calplot's data
+
+    x : str = "x"
+        The name of the date like column in data
+
+    y : str = "y"
+        The name of the value column in data
+
+    end : date like = None
+        the last day of the window, defaults to the last day in data, which
+        then must have a valid date
+
+    days : int = 365
+        the number of days of the window, end included
+
+    name : str = "y"
+        name of the values shown in the hover text
+
+    dark_theme : bool = False
+        Option for creating a dark themed plot
+
+    month_lines_width : int = 1
+        if month_lines this option controls the width of
+        the line between each month in the calendar
+
+    month_lines_color : str = "#9e9e9e"
+        if month_lines this option controls the color of
+        the line between each month in the calendar
+
+    gap : int = 1
+        controls the gap bewteen daily squares
+
+    colorscale : str = "greens"
+        controls the colorscale for the calendar, works
+        with all the standard Plotly Colorscales and also
+        supports custom colorscales made by the user
+
+    title : str = ""
+        title of the plot
+
+    month_lines: bool = True
+        if true will plot a separation line between
+        each month in the calendar
+
+    total_height : int = 150
+        the height of the plot
+
+    showscale : bool = False
+        if True, a color legend will be created.
+
+    text : Optional[str] = None
+        The name of the column in data to include in hovertext.
+
+    cmap_min : float = None
+        colomap min, defaults to min value of the window
+
+    cmap_max : float = None
+        colomap max, defaults to max value of the window
+
+    date_fmt : str = "%Y-%m-%d"
+        date format for the date column in data, defaults to "%Y-%m-%d"
+        If the date column is already in datetime format, this parameter
+        will be ignored.
+
+    date_unit : str = None
+        epoch unit ("s", "ms", "us" or "ns") of a numeric date column,
+        numeric date columns are only accepted when it is provided
+
+    dedupe_dates : bool = False
+        if True string dates are parsed once per distinct value
+
+    chunksize : int = 1_000_000
+        rows per chunk when data is a path to a CSV or Parquet file
+
+    cost_budget : CostBudget = None
+        if provided, the figure is measured with get_figure_cost and a
+        warning is emitted, or an error raised, when it goes over the
+        budget. The measured cost is kept in fig.layout.meta["cost"]
+    """
+    import numpy as np
+    import pandas as pd
+    from plotly import graph_objects as go
+
+    from plotly_calplot.cost import apply_cost_budget
+    from plotly_calplot.date_extractors import MONTH_NAMES, get_window_coordinates
+    from plotly_calplot.layout_formatter import (
+        COLORAXIS,
+        apply_coloraxis,
+        create_month_lines_trace,
+        decide_layout,
+        get_month_lines_path,
+    )
+    from plotly_calplot.paging import prepare_calplot
+    from plotly_calplot.utils import get_window_grid
+
+    if days < 1:
+        raise ValueError("days must be at least 1")
+    prepared = prepare_calplot(
+        data,
+        x,
+        y,
+        text=text,
+        date_fmt=date_fmt,
+        date_unit=date_unit,
+        dedupe_dates=dedupe_dates,
+        chunksize=chunksize,
+    )
+    if end is None:
+        valid_days = prepared.days[~np.isnat(prepared.days)]
+        if not len(valid_days):
+            raise ValueError("data has no valid dates, the window needs an end")
+        last_day = valid_days.max()
+    else:
+        last_day = np.datetime64(pd.Timestamp(end).date(), "D")
+    calendar_days = np.arange(last_day - days + 1, last_day + 1)
+    weekdays, week_columns = get_window_coordinates(calendar_days)
+
+    def _grid(values: Any, fill_value: Any = np.nan) -> Any:
+        return get_window_grid(
+            prepared.days,
+            values,
+            calendar_days[0],
+            weekdays,
+            week_columns,
+            fill_value,
+        )
+
+    z = _grid(prepared.columns[y])
+    dates = np.full(z.shape, "", dtype=object)
+    dates[weekdays, week_columns] = np.datetime_as_string(calendar_days, unit="D")
+    hovertemplate = "%{customdata} <br>" + name + "=%{z}"
+    if text is not None:
+        hovertemplate += f" <br>{text}=%{{text}}"
+    traces = [
+        go.Heatmap(
+            z=z,
+            customdata=dates,
+            text=None if text is None else _grid(prepared.columns[text], ""),
+            xgap=gap,
+            ygap=gap,
+            coloraxis=COLORAXIS,
+            hoverongaps=False,
+            hovertemplate=hovertemplate,
+            name=name,
+        )
+    ]
+    if month_lines:
+        xs, ys = get_month_lines_path(calendar_days, weekdays, week_columns)
+        traces.append(
+            create_month_lines_trace(month_lines_color, month_lines_width, xs, ys)
+        )
+
+    # every month starting in the window is labelled, January with its year
+    first_days = calendar_days.astype("datetime64[M]").astype("datetime64[D]")
+    first_days = np.flatnonzero(first_days == calendar_days)
+    month_names = []
+    for day in calendar_days[first_days].astype(object):
+        month_name = MONTH_NAMES[day.month - 1]
+        month_names.append(f"{month_name} {day.year}" if day.month == 1 else month_name)
+    layout = decide_layout(
+        dark_theme, title, month_names, week_columns[first_days] + 1.5
+    )
 
-    return fig
+    if not np.isnan(z).all():
+        # the colors follow the values of the window, not of the whole data
+        cmap_min = np.nanmin(z) if cmap_min is None else cmap_min
+        cmap_max = np.nanmax(z) if cmap_max is None else cmap_max
+    fig = go.Figure(data=traces, layout=layout).update_layout(height=total_height)
+    fig = apply_coloraxis(fig, colorscale, cmap_min, cmap_max, showscale)
+    return apply_cost_budget(fig, cost_budget)
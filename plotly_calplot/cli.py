@@ -0,0 +1,180 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from plotly_calplot.html_bundle import write_plotlyjs
+from plotly_calplot.serialization import COMPRESSIONS, write_figure_json
+
+PLOT_KINDS = ("calplot", "month_calplot", "window_calplot")
+OUTPUT_FORMATS = ("html", "json")
+COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "brotli": ".br"}
+
+
+def parse_option(option: str) -> Dict[str, Any]:
+    """
+    Parses a KEY=VALUE option, VALUE is read as JSON when possible so that
+    numbers and booleans keep their type, otherwise it is kept as a string
+    """
+    key, separator, value = option.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"options must be KEY=VALUE, got {option}")
+    try:
+        return {key: json.loads(value)}
+    except json.JSONDecodeError:
+        return {key: value}
+
+
+def expand_inputs(inputs: List[str]) -> List[str]:
+    """
+    Expands the glob patterns among the inputs, keeping the order and
+    dropping repeated files
+
+    Raises:
+        FileNotFoundError: If an input matches no file.
+    """
+    paths: Dict[str, None] = {}
+    for pattern in inputs:
+        matches = sorted(glob.glob(pattern))
+        if not matches:
+            raise FileNotFoundError(f"no files matched {pattern}")
+        for path in matches:
+            paths[path] = None
+    return list(paths)
+
+
+def get_output_stems(paths: List[str]) -> List[str]:
+    """
+    Output name of every input without its extension, the path relative to
+    the deepest folder holding all the inputs with the separators replaced
+    by underscores, so that a/data.csv and b/data.csv don't overwrite each
+    other
+
+    Raises:
+        ValueError: If two inputs would still get the same name.
+    """
+    absolute_paths = [os.path.abspath(path) for path in paths]
+    root = os.path.commonpath([os.path.dirname(path) for path in absolute_paths])
+    stems: Dict[str, str] = {}
+    for path, absolute_path in zip(paths, absolute_paths):
+        relative_path = os.path.relpath(absolute_path, root)
+        stem = os.path.splitext(relative_path)[0].replace(os.sep, "_")
+        if stem in stems:
+            raise ValueError(
+                f"{stems[stem]} and {path} would both be written as {stem}"
+            )
+        stems[stem] = path
+    return list(stems)
+
+
+def render_file(
+    path: str,
+    stem: str,
+    output_dir: str,
+    x: str,
+    y: str,
+    kind: str,
+    output_format: str,
+    options: Dict[str, Any],
+    compression: Optional[str] = None,
+) -> str:
+    """
+    Renders one CSV or Parquet file and writes the figure to output_dir
+    as stem with the extension of the format, returns the path written
+    """
+    import plotly_calplot
+
+    fig = getattr(plotly_calplot, kind)(path, x, y, **options)
+    output_path = os.path.join(output_dir, f"{stem}.{output_format}")
+    if output_format == "html":
+        # every page points to the single plotly.js written next to them
+        with open(output_path, "w", encoding="utf-8") as output_file:
+            output_file.write(fig.to_html(include_plotlyjs="directory"))
+    else:
+        output_path += COMPRESSION_SUFFIXES[compression]
+        with open(output_path, "wb") as binary_file:
+            write_figure_json(fig, binary_file, compression)
+    return output_path
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="plotly-calplot",
+        description="Render calendar heatmaps of many CSV or Parquet files.",
+    )
+    parser.add_argument("inputs", nargs="+", help="input files or glob patterns")
+    parser.add_argument("-x", required=True, help="name of the date column")
+    parser.add_argument("-y", required=True, help="name of the value column")
+    parser.add_argument("--kind", choices=PLOT_KINDS, default="calplot")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="html")
+    parser.add_argument(
+        "--compression",
+        choices=COMPRESSIONS,
+        help="compress JSON output, brotli needs the brotli package",
+    )
+    parser.add_argument("-o", "--output-dir", default=".")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="amount of worker processes, defaults to the amount of CPUs",
+    )
+    parser.add_argument(
+        "--option",
+        dest="options",
+        type=parse_option,
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="option passed to the plot function, e.g. --option dark_theme=true",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    try:
+        paths = expand_inputs(args.inputs)
+        stems = get_output_stems(paths)
+    except (FileNotFoundError, ValueError) as error:
+        parser.error(str(error))
+    options: Dict[str, Any] = {}
+    for option in args.options:
+        options.update(option)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    if args.format == "html":
+        write_plotlyjs(args.output_dir)
+
+    render = partial(
+        render_file,
+        output_dir=args.output_dir,
+        x=args.x,
+        y=args.y,
+        kind=args.kind,
+        output_format=args.format,
+        options=options,
+        compression=args.compression,
+    )
+    start = time.perf_counter()
+    if args.jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(paths))) as executor:
+            outputs = list(executor.map(render, paths, stems))
+    else:
+        outputs = [render(path, stem) for path, stem in zip(paths, stems)]
+    elapsed = time.perf_counter() - start
+
+    input_megabytes = sum(os.path.getsize(path) for path in paths) / 1e6
+    print(
+        f"Rendered {len(outputs)} files ({input_megabytes:.1f} MB) in {elapsed:.2f}s,"
+        f" {len(outputs) / elapsed:.1f} files/s, {input_megabytes / elapsed:.1f} MB/s",
+        file=sys.stderr,
+    )
+    return 0
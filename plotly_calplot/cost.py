@@ -0,0 +1,189 @@
+import base64
+import struct
+import warnings
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, List, Optional
+
+if TYPE_CHECKING:
+    from plotly import graph_objects as go
+
+COST_ACTIONS = ("warn", "raise")
+PNG_DATA_URI = "data:image/png;base64,"
+
+
+class FigureCostWarning(UserWarning):
+    pass
+
+
+class FigureCostError(ValueError):
+    pass
+
+
+@dataclass
+class FigureCost:
+    """
+    What a figure will cost to ship and draw.
+
+    Attributes:
+        heatmap_traces (int): Heatmap traces, the background grid included.
+        scatter_traces (int): Scatter traces, month lines mostly.
+        other_traces (int): Traces of any other type.
+        cells (int): Heatmap cells and image pixels, of images given as
+            z or as a PNG data URI source.
+        subplots (int): Distinct pairs of axes the traces are drawn on.
+        axes (int): x and y axes in the layout.
+        json_bytes (int): Size of the figure serialized to JSON.
+    """
+
+    heatmap_traces: int
+    scatter_traces: int
+    other_traces: int
+    cells: int
+    subplots: int
+    axes: int
+    json_bytes: int
+
+    @property
+    def traces(self) -> int:
+        return self.heatmap_traces + self.scatter_traces + self.other_traces
+
+
+@dataclass
+class CostBudget:
+    """
+    Limits a rendered figure should stay within, a None limit isn't checked.
+
+    Attributes:
+        max_traces (Optional[int]): Traces of any type.
+        max_cells (Optional[int]): Heatmap cells and image pixels.
+        max_subplots (Optional[int]): Subplots.
+        max_json_bytes (Optional[int]): Size of the serialized figure.
+        action (str): "warn" to emit a FigureCostWarning when a limit is
+            exceeded, "raise" to raise a FigureCostError.
+    """
+
+    max_traces: Optional[int] = None
+    max_cells: Optional[int] = None
+    max_subplots: Optional[int] = None
+    max_json_bytes: Optional[int] = None
+    action: str = "warn"
+
+    def __post_init__(self) -> None:
+        if self.action not in COST_ACTIONS:
+            raise ValueError(f"action must be one of {COST_ACTIONS}, got {self.action}")
+
+
+def _count_cells(values: Any) -> int:
+    import numpy as np
+
+    if values is None:
+        return 0
+    # 2D z grids and images come as nested tuples
+    return int(np.asarray(values, dtype=object).size)
+
+
+def _count_pixels(image: Any) -> int:
+    import numpy as np
+
+    if image.z is not None:
+        # every pixel holds its color channels
+        height, width = np.asarray(image.z, dtype=object).shape[:2]
+        return int(height * width)
+    source = image.source or ""
+    if not source.startswith(PNG_DATA_URI):
+        return 0
+    # the size is in the IHDR chunk, right after the 8 bytes PNG signature
+    start = len(PNG_DATA_URI)
+    stop = start + 32
+    width, height = struct.unpack(">II", base64.b64decode(source[start:stop])[16:24])
+    return int(width * height)
+
+
+def get_figure_cost(fig: "go.Figure") -> FigureCost:
+    """
+    Counts the traces, cells, subplots and axes of a figure and the bytes
+    of its JSON.
+
+    Parameters:
+        fig (go.Figure): The figure, as returned by calplot or month_calplot.
+
+    Returns:
+        FigureCost: The cost of the figure.
+    """
+    import plotly.io as pio
+
+    trace_types = [trace.type for trace in fig.data]
+    heatmap_traces = trace_types.count("heatmap")
+    scatter_traces = trace_types.count("scatter")
+    cells = sum(
+        _count_cells(trace.z) for trace in fig.data if trace.type == "heatmap"
+    ) + sum(_count_pixels(trace) for trace in fig.data if trace.type == "image")
+    subplots = {
+        (trace.xaxis or "x", trace.yaxis or "y")
+        for trace in fig.data
+        if hasattr(trace, "xaxis")
+    }
+    axes = len(list(fig.select_xaxes())) + len(list(fig.select_yaxes()))
+    json_bytes = len(pio.to_json(fig, validate=False).encode("utf-8"))
+    return FigureCost(
+        heatmap_traces=heatmap_traces,
+        scatter_traces=scatter_traces,
+        other_traces=len(trace_types) - heatmap_traces - scatter_traces,
+        cells=cells,
+        subplots=len(subplots),
+        axes=axes,
+        json_bytes=json_bytes,
+    )
+
+
+def check_figure_cost(fig: "go.Figure", budget: CostBudget) -> FigureCost:
+    """
+    Measures the figure with get_figure_cost and warns or raises, following
+    budget.action, when it goes over any of the budget's limits.
+
+    Parameters:
+        fig (go.Figure): The figure to check.
+        budget (CostBudget): The limits to check against.
+
+    Returns:
+        FigureCost: The cost of the figure.
+
+    Raises:
+        FigureCostError: If a limit is exceeded and budget.action is "raise".
+    """
+    cost = get_figure_cost(fig)
+    measured = asdict(cost)
+    measured["traces"] = cost.traces
+    exceeded: List[str] = []
+    for name in ["traces", "cells", "subplots", "json_bytes"]:
+        limit = getattr(budget, f"max_{name}")
+        if limit is not None and measured[name] > limit:
+            exceeded.append(f"{name} {measured[name]} > {limit}")
+    if exceeded:
+        message = "Figure over its cost budget: " + ", ".join(exceeded)
+        if budget.action == "raise":
+            raise FigureCostError(message)
+        warnings.warn(message, FigureCostWarning, stacklevel=3)
+    return cost
+
+
+def apply_cost_budget(fig: "go.Figure", budget: Optional[CostBudget]) -> "go.Figure":
+    """
+    What every plot function does with its cost_budget: when there is one,
+    the figure is checked with check_figure_cost and the measured cost is
+    kept, as a dict, in fig.layout.meta["cost"]
+
+    Parameters:
+        fig (go.Figure): The figure to check.
+        budget (Optional[CostBudget]): The limits to check against.
+
+    Returns:
+        go.Figure: The figure.
+
+    Raises:
+        FigureCostError: If a limit is exceeded and budget.action is "raise".
+    """
+    if budget is not None:
+        cost = check_figure_cost(fig, budget)
+        fig.update_layout(meta={"cost": asdict(cost)})
+    return fig
@@ -1,8 +1,25 @@
 from typing import Any, List, Tuple
 
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
+# the names pandas' month_name gives, so both don't depend on the locale
+MONTH_NAMES = (
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+
 
 def get_month_names(
     data: pd.DataFrame, x: str, start_month: int = 1, end_month: int = 12
@@ -35,3 +52,70 @@ def get_date_coordinates(
     weeknumber_of_dates = data[x].dt.strftime("%W").astype(int).tolist()
 
     return month_positions, weekdays_in_year, weeknumber_of_dates
+
+
+def get_sparse_padding(
+    weeknumber_of_dates: List[int],
+    weekdays_in_year: List[float],
+    calendar_weeknumbers: List[int],
+) -> Tuple[List[int], List[float]]:
+    """
+    Plotly sizes the cells of a heatmap given as x/y/z columns from the
+    distance between neighbouring x and y values, so a heatmap holding only
+    a few days would get cells spanning several weeks. This returns the
+    coordinates of one empty cell for each calendar week and weekday without
+    data, which keeps every cell one week wide and one day tall.
+    """
+    observed_weeks = set(weeknumber_of_dates)
+    observed_weekdays = set(weekdays_in_year)
+    pad_weeks = [
+        w for w in sorted(set(calendar_weeknumbers)) if w not in observed_weeks
+    ]
+    pad_weekdays: List[float] = [0] * len(pad_weeks)
+
+    # an observed week paired with an unobserved weekday can't hold data either
+    any_week = (weeknumber_of_dates or calendar_weeknumbers)[0]
+    for weekday in range(7):
+        if weekday not in observed_weekdays:
+            pad_weeks.append(any_week)
+            pad_weekdays.append(weekday)
+    return pad_weeks, pad_weekdays
+
+
+def get_vectorized_date_parts(
+    days: npt.ArrayLike,
+) -> Tuple[
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+]:
+    """
+    Year, month, weekday (Monday is 0) and %W week number of every
+    datetime64[D] value, computed with integer arithmetic instead of
+    per-date Python calls
+    """
+    days = np.asarray(days, dtype="datetime64[D]")
+    years = days.astype("datetime64[Y]")
+    months = days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    day_of_year = (days - years.astype("datetime64[D]")).astype(np.int64)
+    # 1970-01-01, day zero, was a Thursday
+    weekdays = (days.astype(np.int64) + 3) % 7
+    # %W counts the weeks starting on the first Monday of the year, the days
+    # before it belong to week 0
+    weeknumbers = (day_of_year + 7 - weekdays) // 7
+    return years.astype(np.int64) + 1970, months, weekdays, weeknumbers
+
+
+def get_window_coordinates(
+    days: npt.NDArray[np.datetime64],
+) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Weekday (Monday is 0) and week column of every day of a continuous range
+    of datetime64[D] days. The weeks are counted from the one holding the
+    first day, so the range is laid out as a single grid whatever years it
+    crosses
+    """
+    weekdays = (days.astype(np.int64) + 3) % 7
+    week_columns = (np.arange(len(days)) + (weekdays[0] if len(days) else 0)) // 7
+    return weekdays, week_columns
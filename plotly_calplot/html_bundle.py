@@ -0,0 +1,165 @@
+import html
+import os
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    from plotly import graph_objects as go
+
+PLOTLYJS_FILE = "plotly.min.js"
+DEFAULT_FIGURE_HEIGHT = 450
+
+# each figure is drawn the first time its div gets close to the viewport, browsers
+# without IntersectionObserver draw everything on load
+LAZY_LOADER = """
+(function (lazy) {
+  function draw(div) {
+    var figure = JSON.parse(document.getElementById(div.id + "-data").textContent);
+    Plotly.newPlot(div, figure.data, figure.layout, figure.config);
+  }
+  var divs = document.querySelectorAll("div.calplot-figure");
+  if (!("IntersectionObserver" in window) || !lazy) {
+    divs.forEach(draw);
+    return;
+  }
+  var observer = new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+      if (entry.isIntersecting) {
+        observer.unobserve(entry.target);
+        draw(entry.target);
+      }
+    });
+  }, {rootMargin: "200px"});
+  divs.forEach(function (div) { observer.observe(div); });
+})"""
+
+
+def get_plotlyjs_script(include_plotlyjs: Union[bool, str]) -> str:
+    """
+    The script tag loading plotly.js, following the include_plotlyjs options
+    of plotly's write_html: True inlines it, "cdn" loads it from the plotly
+    CDN, "directory" from a plotly.min.js next to the page, a path ending in
+    .js from that path and False leaves it to the page's owner
+    """
+    if include_plotlyjs is True:
+        from plotly.offline import get_plotlyjs
+
+        return f'<script type="text/javascript">{get_plotlyjs()}</script>'
+    if include_plotlyjs == "cdn":
+        from plotly.offline import get_plotlyjs_version
+
+        source = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+        return f'<script src="{source}"></script>'
+    if include_plotlyjs == "directory":
+        return f'<script src="{PLOTLYJS_FILE}"></script>'
+    if isinstance(include_plotlyjs, str) and include_plotlyjs.endswith(".js"):
+        return f'<script src="{html.escape(include_plotlyjs)}"></script>'
+    if include_plotlyjs is False:
+        return ""
+    raise ValueError(f"Invalid include_plotlyjs value: {include_plotlyjs}")
+
+
+def write_plotlyjs(output_dir: str) -> None:
+    """
+    Writes plotly.min.js to output_dir unless it is already there
+    """
+    from plotly.offline import get_plotlyjs
+
+    plotlyjs_path = os.path.join(output_dir, PLOTLYJS_FILE)
+    if not os.path.exists(plotlyjs_path):
+        with open(plotlyjs_path, "w", encoding="utf-8") as plotlyjs_file:
+            plotlyjs_file.write(get_plotlyjs())
+
+
+def _get_figure_json(fig: "go.Figure", config: Dict[str, Any]) -> str:
+    import plotly.io as pio
+
+    figure_json: str = pio.to_json(
+        {"data": fig.data, "layout": fig.layout, "config": config}, validate=False
+    )
+    # the JSON is inlined in a script element, which a "</" would close early
+    return figure_json.replace("</", "<\\/")
+
+
+def figures_to_html(
+    figures: Sequence["go.Figure"],
+    titles: Optional[Sequence[str]] = None,
+    include_plotlyjs: Union[bool, str] = True,
+    lazy: bool = True,
+    config: Optional[Dict[str, Any]] = None,
+    page_title: str = "",
+) -> str:
+    """
+    Renders many figures into a single HTML document that loads plotly.js
+    once. Every figure is inlined as compact JSON and, when lazy, only drawn
+    once it is scrolled near the viewport, so the cost of figures below the
+    fold is their data rather than a plotly.js each.
+
+    Parameters:
+        figures (Sequence[go.Figure]): The figures, in page order.
+        titles (Optional[Sequence[str]]): A heading above each figure.
+        include_plotlyjs (Union[bool, str]): How plotly.js is loaded, same
+            options as plotly's write_html.
+        lazy (bool): Draw the figures as they scroll into view.
+        config (Optional[Dict[str, Any]]): plotly.js config of every figure.
+        page_title (str): The title of the document.
+
+    Returns:
+        str: The HTML document.
+
+    Raises:
+        ValueError: If titles and figures differ in length.
+    """
+    if titles is not None and len(titles) != len(figures):
+        raise ValueError("titles must have one title per figure")
+    config = {"responsive": True} if config is None else config
+
+    body: List[str] = []
+    for i, fig in enumerate(figures):
+        if titles is not None:
+            body.append(f"<h2>{html.escape(titles[i])}</h2>")
+        height = fig.layout.height or DEFAULT_FIGURE_HEIGHT
+        body.append(
+            f'<div id="calplot-{i}" class="calplot-figure"'
+            f' style="height:{height}px;width:100%;"></div>'
+        )
+        body.append(
+            f'<script type="application/json" id="calplot-{i}-data">'
+            f"{_get_figure_json(fig, config)}</script>"
+        )
+    loader = f"{LAZY_LOADER}({'true' if lazy else 'false'});"
+
+    return "\n".join(
+        [
+            "<!DOCTYPE html>",
+            '<html><head><meta charset="utf-8">',
+            f"<title>{html.escape(page_title)}</title>",
+            get_plotlyjs_script(include_plotlyjs),
+            "</head><body>",
+            *body,
+            f"<script>{loader}</script>",
+            "</body></html>",
+        ]
+    )
+
+
+def write_html_bundle(
+    figures: Sequence["go.Figure"],
+    path: Union[str, "os.PathLike[str]"],
+    titles: Optional[Sequence[str]] = None,
+    include_plotlyjs: Union[bool, str] = True,
+    lazy: bool = True,
+    config: Optional[Dict[str, Any]] = None,
+    page_title: str = "",
+) -> None:
+    """
+    Writes figures_to_html to path, with include_plotlyjs="directory" the
+    plotly.min.js the page points to is written next to it
+    """
+    document = figures_to_html(
+        figures, titles, include_plotlyjs, lazy, config, page_title
+    )
+    path = os.fspath(path)
+    if include_plotlyjs == "directory":
+        write_plotlyjs(os.path.dirname(os.path.abspath(path)))
+    with open(path, "w", encoding="utf-8") as html_file:
+        html_file.write(document)
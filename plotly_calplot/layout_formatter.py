@@ -1,8 +1,12 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 from plotly import graph_objects as go
 
+COLORAXIS = "coloraxis"
+
 
 def decide_layout(
     dark_theme: bool,
@@ -69,7 +73,7 @@ def create_month_lines(
     cplt: List[go.Figure],
     month_lines_color: str,
     month_lines_width: int,
-    data: pd.DataFrame,
+    data: "pd.Series[Any]",
     weekdays_in_year: List[float],
     weeknumber_of_dates: List[int],
 ) -> go.Figure:
@@ -91,38 +95,122 @@ def create_month_lines(
     return cplt
 
 
+def get_month_lines_path(
+    days: npt.NDArray[np.datetime64],
+    weekdays: npt.NDArray[np.int64],
+    weeknumbers: npt.NDArray[np.int64],
+    row_offsets: Union[Sequence[float], npt.NDArray[np.int64]] = (0,),
+) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """
+    Same separators as create_month_lines as the coordinates of a single
+    path, each month boundary is a polyline followed by a NaN which plotly
+    draws as a break. The path is repeated for every row offset when
+    several calendars share the same axes.
+    """
+    first_days = days.astype("datetime64[M]").astype("datetime64[D]") == days
+    wkn = weeknumbers[first_days].astype(float)
+    dow = weekdays[first_days].astype(float)
+    # the step around the first day is only needed when it isn't a Monday
+    right = wkn - 0.5 + (dow > 0)
+    breaks = np.full_like(wkn, np.nan)
+    xs = np.stack([wkn - 0.5, wkn - 0.5, right, right, breaks], axis=1).ravel()
+    ys = np.stack(
+        [np.full_like(dow, 6.5), dow - 0.5, dow - 0.5, np.full_like(dow, -0.5), breaks],
+        axis=1,
+    ).ravel()
+    offsets = np.asarray(row_offsets, dtype=float)
+    return np.tile(xs, len(offsets)), (ys[None, :] + offsets[:, None]).ravel()
+
+
+def create_month_lines_trace(
+    month_lines_color: str,
+    month_lines_width: int,
+    xs: npt.NDArray[np.float64],
+    ys: npt.NDArray[np.float64],
+) -> go.Scatter:
+    return go.Scatter(
+        x=xs,
+        y=ys,
+        mode="lines",
+        line=dict(color=month_lines_color, width=month_lines_width),
+        hoverinfo="skip",
+    )
+
+
 def update_plot_with_current_layout(
     fig: go.Figure,
     cplt: go.Figure,
     row: int,
     layout: go.Layout,
-    total_height: Optional[int],
     years_as_columns: bool,
 ) -> go.Figure:
-    fig.update_layout(layout)
-    fig.update_xaxes(layout["xaxis"])
-    fig.update_yaxes(layout["yaxis"])
-    fig.update_layout(height=total_height)
+    """
+    Adds the year traces to its subplot and sets only that subplot's axes,
+    settings shared by every subplot are applied once by apply_shared_layout
+    """
     if years_as_columns:
         rows = [1] * len(cplt)
         cols = [(row + 1)] * len(cplt)
     else:
         rows = [(row + 1)] * len(cplt)
         cols = [1] * len(cplt)
+    # make_subplots numbers the axes row by row, and since the years are laid
+    # out either in a single row or in a single column the n-th year always
+    # sits on the n-th pair of axes
+    axis_suffix = "" if row == 0 else str(row + 1)
+    fig.layout["xaxis" + axis_suffix].update(layout["xaxis"])
+    fig.layout["yaxis" + axis_suffix].update(layout["yaxis"])
     fig.add_traces(cplt, rows=rows, cols=cols)
     return fig
 
 
-def apply_general_colorscaling(
-    fig: go.Figure, cmap_min: float, cmap_max: float
+def add_year_payloads(
+    fig: go.Figure, payloads: List[Tuple[List[Dict[str, Any]], Dict[str, Any]]]
 ) -> go.Figure:
-    return fig.update_traces(
-        selector=dict(type="heatmap"), zmax=cmap_max, zmin=cmap_min
-    )
+    """
+    Adds the traces and axes of every year, given as plain dicts, with a
+    single add_traces and a single update_layout, since plotly goes through
+    the whole figure on every update. Like in update_plot_with_current_layout
+    the n-th year sits on the n-th pair of axes
+    """
+    traces: List[Dict[str, Any]] = []
+    axes: Dict[str, Any] = {}
+    for row, (year_traces, year_axes) in enumerate(payloads):
+        axis_suffix = "" if row == 0 else str(row + 1)
+        for trace in year_traces:
+            trace.update(xaxis="x" + axis_suffix, yaxis="y" + axis_suffix)
+        traces.extend(year_traces)
+        axes["xaxis" + axis_suffix] = year_axes["xaxis"]
+        axes["yaxis" + axis_suffix] = year_axes["yaxis"]
+    fig.add_traces(traces)
+    return fig.update_layout(axes)
 
 
-def showscale_of_heatmaps(fig: go.Figure) -> go.Figure:
-    return fig.update_traces(
-        showscale=True,
-        selector=dict(type="heatmap"),
+def apply_shared_layout(
+    fig: go.Figure, layout: go.Layout, total_height: Optional[int]
+) -> go.Figure:
+    """
+    Applies the layout settings that don't depend on the year
+    """
+    shared_layout = layout.to_plotly_json()
+    shared_layout.pop("xaxis", None)
+    shared_layout.pop("yaxis", None)
+    return fig.update_layout(shared_layout, height=total_height)
+
+
+def apply_coloraxis(
+    fig: go.Figure,
+    colorscale: Any,
+    cmap_min: Optional[float],
+    cmap_max: Optional[float],
+    showscale: bool,
+) -> go.Figure:
+    """
+    Sets the color settings of the heatmaps that reference the layout's
+    coloraxis, once for all of them
+    """
+    return fig.update_layout(
+        coloraxis=dict(
+            colorscale=colorscale, cmin=cmap_min, cmax=cmap_max, showscale=showscale
+        )
     )
@@ -0,0 +1,197 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from plotly import graph_objects as go
+
+from plotly_calplot.streaming import DEFAULT_CHUNKSIZE, CalplotSource, as_frame
+from plotly_calplot.utils import (
+    get_daily_days,
+    get_year_slices,
+    split_columns_by_year,
+    validate_date_column,
+)
+
+
+class PreparedCalplot:
+    """
+    calplot data validated, sorted by day and split by year once, so that
+    any window of years can be drawn from it without going through the whole
+    data again. Pages count from the most recent years.
+
+    Attributes:
+        x (str): The name of the date column.
+        y (str): The name of the value column.
+        text (Optional[str]): The name of the hover text column.
+        start_month (int): The first month of every year.
+        end_month (int): The last month of every year.
+        days (np.ndarray): Sorted datetime64[D] day of every row.
+        columns (Dict[str, np.ndarray]): The value and text columns, in the
+            order of days.
+        year_slices (List[Tuple[int, slice]]): The slice of days of every
+            year with data, in ascending order.
+        value_min (Any): Minimum of the values of every year, the default
+            cmap_min of every page so that pages share their colors.
+        value_max (Any): Maximum of the values of every year.
+        unique_days (bool): The days have no repeats, which lets every year
+            be filled by day offset alone.
+    """
+
+    def __init__(
+        self,
+        x: str,
+        y: str,
+        text: Optional[str],
+        start_month: int,
+        end_month: int,
+        days: npt.NDArray[np.datetime64],
+        columns: Dict[str, npt.NDArray[Any]],
+        year_slices: List[Tuple[int, slice]],
+        value_min: Any,
+        value_max: Any,
+        unique_days: bool = False,
+    ) -> None:
+        self.x = x
+        self.y = y
+        self.text = text
+        self.start_month = start_month
+        self.end_month = end_month
+        self.days = days
+        self.columns = columns
+        self.year_slices = year_slices
+        self.value_min = value_min
+        self.value_max = value_max
+        self.unique_days = unique_days
+
+    @property
+    def years(self) -> List[int]:
+        return [year for year, _ in self.year_slices]
+
+    def n_pages(self, n_years: int = 2) -> int:
+        return -(-len(self.year_slices) // n_years)
+
+    def page(self, index: int = 0, n_years: int = 2, **kwargs: Any) -> go.Figure:
+        """
+        Draws the index-th page of n_years years, page 0 holds the most
+        recent years. kwargs are calplot's drawing options.
+
+        Raises:
+            IndexError: If the page is out of range.
+        """
+        if not 0 <= index < self.n_pages(n_years):
+            raise IndexError(f"page {index} out of range")
+        stop = len(self.year_slices) - index * n_years
+        start = max(0, stop - n_years)
+        return self._render(self.year_slices[start:stop], kwargs)
+
+    def window(self, first_year: int, last_year: int, **kwargs: Any) -> go.Figure:
+        """
+        Draws the years from first_year to last_year included, kwargs are
+        calplot's drawing options.
+
+        Raises:
+            IndexError: If there is no data in those years.
+        """
+        year_slices = [
+            (year, year_slice)
+            for year, year_slice in self.year_slices
+            if first_year <= year <= last_year
+        ]
+        if not year_slices:
+            raise IndexError(f"no data between {first_year} and {last_year}")
+        return self._render(year_slices, kwargs)
+
+    def _render(
+        self, year_slices: List[Tuple[int, slice]], kwargs: Dict[str, Any]
+    ) -> go.Figure:
+        from plotly_calplot.calplot import _render_calplot
+
+        return _render_calplot(self, year_slices, **kwargs)
+
+
+def _is_array_pair(data: Any) -> bool:
+    return (
+        isinstance(data, tuple)
+        and len(data) == 2
+        and not any(isinstance(item, pd.DataFrame) for item in data)
+    )
+
+
+def _get_dates_and_values(data: Any) -> Tuple[Any, npt.NDArray[Any]]:
+    """
+    The dates and values of a Series indexed by date or of a (dates, values)
+    pair of arrays, tz-aware dates keep their local wall time
+    """
+    if isinstance(data, pd.Series):
+        dates, values = data.index, data.to_numpy()
+    else:
+        dates, values = data[0], np.asarray(data[1])
+    if isinstance(dates, pd.DatetimeIndex) and dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return dates, values
+
+
+def prepare_calplot(
+    data: CalplotSource,
+    x: str = "x",
+    y: str = "y",
+    text: Optional[str] = None,
+    start_month: int = 1,
+    end_month: int = 12,
+    date_fmt: str = "%Y-%m-%d",
+    date_unit: Optional[str] = None,
+    dedupe_dates: bool = False,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> PreparedCalplot:
+    """
+    Validates the dates of data and splits it by year for paging, the
+    parameters are the same as calplot's.
+
+    Returns:
+        PreparedCalplot: The prepared data, draw it with page or window.
+    """
+    if isinstance(data, pd.Series) or _is_array_pair(data):
+        if text is not None:
+            raise ValueError("text can only be used when data is a DataFrame")
+        dates, values = _get_dates_and_values(data)
+        days = get_daily_days(dates)
+        if days is not None:
+            # already clean daily data, nothing to parse, sort or merge
+            return PreparedCalplot(
+                x,
+                y,
+                None,
+                start_month,
+                end_month,
+                days,
+                {y: values},
+                get_year_slices(days, start_month, end_month),
+                pd.Series(values, copy=False).min(),
+                pd.Series(values, copy=False).max(),
+                unique_days=True,
+            )
+        data = pd.DataFrame({x: dates, y: values})
+
+    data = as_frame(data, x, y, date_fmt, date_unit, dedupe_dates, chunksize, text)
+    # data may be shared with other threads, the parsed dates are kept apart
+    # instead of being written back into it
+    dates = validate_date_column(data[x], date_fmt, date_unit, dedupe=dedupe_dates)
+    columns = {y: data[y].to_numpy()}
+    if text is not None:
+        columns[text] = data[text].to_numpy()
+    days, columns, year_slices = split_columns_by_year(
+        dates, columns, start_month, end_month
+    )
+    return PreparedCalplot(
+        x,
+        y,
+        text,
+        start_month,
+        end_month,
+        days,
+        columns,
+        year_slices,
+        data[y].min(),
+        data[y].max(),
+    )
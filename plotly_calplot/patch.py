@@ -0,0 +1,90 @@
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from plotly import graph_objects as go
+
+Patch = Dict[str, Any]
+
+
+def _to_plain_json(fig: "go.Figure") -> Dict[str, Any]:
+    import plotly.io as pio
+
+    # a JSON round trip turns arrays into lists and NaN into None, so both
+    # figures compare the way plotly.js will see them
+    figure: Dict[str, Any] = json.loads(pio.to_json(fig, validate=False))
+    return figure
+
+
+def _diff(old: Any, new: Any, key: str, patch: Patch) -> None:
+    """
+    Adds to patch the attribute strings, like "z[17]" or "line.color", that
+    turn old into new. An array of the same length is patched element by
+    element while at most half of it changed, otherwise it is sent whole.
+    """
+    if old == new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for name in sorted(old.keys() | new.keys()):
+            _diff(old.get(name), new.get(name), f"{key}.{name}" if key else name, patch)
+        return
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        changed = [j for j, (a, b) in enumerate(zip(old, new)) if a != b]
+        if 2 * len(changed) <= len(old):
+            for j in changed:
+                _diff(old[j], new[j], f"{key}[{j}]", patch)
+            return
+    patch[key] = new
+
+
+def get_figure_patch(old: "go.Figure", new: "go.Figure") -> Optional[Dict[str, Any]]:
+    """
+    The smallest Plotly.restyle and Plotly.relayout calls that turn a drawn
+    figure into a new version of it, for example after the value of a day
+    changed, so that updates scale with the changed cells rather than with
+    the size of the figure.
+
+    On the client the patch is applied with
+
+        patch.restyle.forEach(([update, traces]) =>
+            Plotly.restyle(div, update, traces));
+        Plotly.relayout(div, patch.relayout);
+
+    Parameters:
+        old (go.Figure): The figure currently drawn.
+        new (go.Figure): The figure to draw instead.
+
+    Returns:
+        Optional[Dict[str, Any]]: "restyle", a list of [update, trace
+        indices] pairs, and "relayout", a single update. None when the
+        figures don't have the same traces, which needs a Plotly.react
+        with the new figure instead.
+    """
+    old_json, new_json = _to_plain_json(old), _to_plain_json(new)
+    old_traces, new_traces = old_json.get("data", []), new_json.get("data", [])
+    if [t.get("type") for t in old_traces] != [t.get("type") for t in new_traces]:
+        return None
+
+    # traces that need the same update, like a new zmax, share one call
+    restyles: Dict[str, Tuple[Patch, List[int]]] = {}
+    for i, (old_trace, new_trace) in enumerate(zip(old_traces, new_traces)):
+        trace_patch: Patch = {}
+        _diff(old_trace, new_trace, "", trace_patch)
+        if not trace_patch:
+            continue
+        # restyle spreads an array value over the traces, one item each
+        update = {
+            name: [value] if isinstance(value, list) else value
+            for name, value in trace_patch.items()
+        }
+        update_key = json.dumps(update, sort_keys=True)
+        if update_key not in restyles:
+            restyles[update_key] = (update, [])
+        restyles[update_key][1].append(i)
+
+    relayout: Patch = {}
+    _diff(old_json.get("layout", {}), new_json.get("layout", {}), "", relayout)
+    return {
+        "restyle": [[update, traces] for update, traces in restyles.values()],
+        "relayout": relayout,
+    }
@@ -0,0 +1,158 @@
+import base64
+import struct
+import zlib
+from typing import Any, List, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from plotly_calplot.date_extractors import get_vectorized_date_parts
+
+# each year takes the 7 weekday rows plus an empty row separating it from the next
+YEAR_ROWS = 8
+WEEK_COLUMNS = 54
+LUT_SIZE = 256
+
+
+def _parse_color(color: str) -> Tuple[float, float, float, float]:
+    """
+    The 0-255 RGBA channels of a colorscale color: a hex, rgb or rgba
+    string or a CSS color name
+
+    Raises:
+        ValueError: If the color has another form, like hsl.
+    """
+    from pandas.io.formats._color_data import CSS4_COLORS
+
+    text = color.strip().lower()
+    if text in CSS4_COLORS:
+        text = "#" + CSS4_COLORS[text]
+    if text.startswith("#") and len(text) in (4, 7):
+        digits = text[1:]
+        if len(digits) == 3:
+            # short hex, every digit is repeated: #00f is #0000ff
+            digits = "".join(digit * 2 for digit in digits)
+        red, green, blue = bytes.fromhex(digits)
+        return red, green, blue, 255
+    if text.startswith(("rgb(", "rgba(")) and text.endswith(")"):
+        parts = text.partition("(")[2][:-1].split(",")
+        if len(parts) in (3, 4):
+            rgb = [
+                float(part[:-1]) * 2.55 if part.endswith("%") else float(part)
+                for part in (part.strip() for part in parts[:3])
+            ]
+            opacity = float(parts[3]) if len(parts) == 4 else 1.0
+            return rgb[0], rgb[1], rgb[2], opacity * 255
+    raise ValueError(
+        f"image colorscale colors must be hex, rgb, rgba or CSS names, got {color}"
+    )
+
+
+def get_colorscale_lut(colorscale: Any, size: int = LUT_SIZE) -> npt.NDArray[np.uint8]:
+    """
+    Samples a plotly colorscale, in any form the colorscale of a heatmap
+    takes, into a (size, 4) uint8 lookup table of RGBA colors
+
+    Raises:
+        ValueError: If plotly rejects the colorscale or one of its colors
+            can't be read, see _parse_color.
+    """
+    from _plotly_utils.basevalidators import ColorscaleValidator
+
+    # names, lists of colors and [position, color] pairs, as plotly reads them
+    scale = ColorscaleValidator("colorscale", "image_calplot").validate_coerce(
+        colorscale
+    )
+    positions = [float(position) for position, _ in scale]
+    colors = np.array([_parse_color(color) for _, color in scale])
+    samples = np.linspace(0, 1, size)
+    channels = [np.interp(samples, positions, colors[:, i]) for i in range(4)]
+    return np.clip(np.stack(channels, axis=1).round(), 0, 255).astype(np.uint8)
+
+
+def map_values_to_rgba(
+    values: npt.NDArray[np.float64],
+    lut: npt.NDArray[np.uint8],
+    cmap_min: float,
+    cmap_max: float,
+) -> npt.NDArray[np.uint8]:
+    """
+    Maps values to RGBA pixels through the lookup table, values outside
+    [cmap_min, cmap_max] are clipped and NaN values become transparent
+    """
+    rgba = np.zeros(values.shape + (4,), dtype=np.uint8)
+    filled = np.isfinite(values)
+    span = cmap_max - cmap_min
+    scaled = (values[filled] - cmap_min) / span if span else np.zeros(filled.sum())
+    indexes = np.rint(np.clip(scaled, 0, 1) * (len(lut) - 1)).astype(int)
+    rgba[filled] = lut[indexes]
+    return rgba
+
+
+def rasterize_calendar(
+    dates: npt.ArrayLike,
+    values: npt.ArrayLike,
+    start_month: int = 1,
+    end_month: int = 12,
+) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.datetime64], List[int]]:
+    """
+    Lays the values out on the calplot week x weekday grid, with one block
+    of YEAR_ROWS rows per year. Returns the values grid (NaN where there is
+    no data), the matching grid of dates (NaT where there is no data) and
+    the years in the order of the blocks. When a date repeats the last
+    value wins, like in the heatmap traces.
+    """
+    days = np.asarray(dates, dtype="datetime64[D]")
+    values = np.asarray(values, dtype=float)
+    years, months, weekdays, weeknumbers = get_vectorized_date_parts(days)
+    keep = ~np.isnat(days) & (months >= start_month) & (months <= end_month)
+    days, values = days[keep], values[keep]
+    years, weekdays, weeknumbers = years[keep], weekdays[keep], weeknumbers[keep]
+
+    unique_years, year_blocks = np.unique(years, return_inverse=True)
+    shape = (max(len(unique_years) * YEAR_ROWS - 1, 0), WEEK_COLUMNS)
+    rows = year_blocks * YEAR_ROWS + weekdays
+    value_grid = np.full(shape, np.nan)
+    value_grid[rows, weeknumbers] = values
+    date_grid = np.full(shape, np.datetime64("NaT"), dtype="datetime64[D]")
+    date_grid[rows, weeknumbers] = days
+    return value_grid, date_grid, unique_years.tolist()
+
+
+def get_hovertext(
+    value_grid: npt.NDArray[np.float64],
+    date_grid: npt.NDArray[np.datetime64],
+    name: str,
+) -> npt.NDArray[np.object_]:
+    """
+    Builds the hover text of every cell with data, empty cells get no text
+    """
+    hovertext = np.full(value_grid.shape, "", dtype=object)
+    filled = ~np.isnat(date_grid)
+    hovertext[filled] = (
+        np.datetime_as_string(date_grid[filled], unit="D").astype(object)
+        + f" <br>{name}="
+        + value_grid[filled].astype(str).astype(object)
+    )
+    return hovertext
+
+
+def encode_png(rgba: npt.NDArray[np.uint8]) -> str:
+    """
+    Encodes an (height, width, 4) uint8 array as a PNG data URI
+    """
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        crc = zlib.crc32(tag + data) & 0xFFFFFFFF
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", crc)
+
+    height, width = rgba.shape[:2]
+    # every scanline starts with its filter type, 0 means unfiltered
+    scanlines = np.insert(rgba.reshape(height, width * 4), 0, 0, axis=1)
+    png = (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(scanlines.tobytes(), 9))
+        + chunk(b"IEND", b"")
+    )
+    return "data:image/png;base64," + base64.b64encode(png).decode("ascii")
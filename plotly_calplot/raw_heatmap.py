@@ -1,9 +1,13 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
 from plotly import graph_objects as go
 
+BACKGROUND_NAME = "background"
+BACKGROUND_LIGHT_COLOR = "#ebedf0"
+BACKGROUND_DARK_COLOR = "#444"
+
 
 def create_heatmap_without_formatting(
     data: pd.DataFrame,
@@ -17,7 +21,16 @@ def create_heatmap_without_formatting(
     name: str,
     text: Optional[List[str]] = None,
     text_name: Optional[str] = None,
+    hoverongaps: Optional[bool] = None,
+    coloraxis: Optional[str] = None,
 ) -> List[go.Figure]:
+    """
+    The heatmap of a year's days, its colors come from the layout's
+    coloraxis when one is given and from colorscale otherwise
+    """
+    color_kwargs: Dict[str, Any] = {"showscale": False, "colorscale": colorscale}
+    if coloraxis is not None:
+        color_kwargs = {"coloraxis": coloraxis}
     hovertemplate_extra = ""
     if text is not None:
         hovertemplate_extra = " <br>"
@@ -31,15 +44,45 @@ def create_heatmap_without_formatting(
             z=data[y],
             xgap=gap,  # this
             ygap=gap,  # and this is used to make the grid-like apperance
-            showscale=False,
-            colorscale=colorscale,  # user can setup their colorscale
             text=text,
             hovertemplate=(
                 "%{customdata[0]} <br>Week=%{x} <br>%{customdata[1]}=%{z}"
                 + hovertemplate_extra
             ),
-            customdata=np.stack((data[x].astype(str), [name] * data.shape[0]), axis=-1),
+            customdata=np.stack(
+                (
+                    np.datetime_as_string(data[x].to_numpy(), unit="D"),
+                    [name] * data.shape[0],
+                ),
+                axis=-1,
+            ),
             name=str(year),
+            hoverongaps=hoverongaps,
+            **color_kwargs,
         )
     ]
     return raw_heatmap
+
+
+def create_background_heatmap(
+    weeknumber_of_dates: List[int],
+    weekdays_in_year: List[float],
+    gap: int,
+    dark_theme: bool,
+) -> go.Heatmap:
+    """
+    Single colored grid with one cell per calendar day and no hover, drawn
+    behind sparse heatmaps so the calendar shape shows even without data
+    """
+    color = BACKGROUND_DARK_COLOR if dark_theme else BACKGROUND_LIGHT_COLOR
+    z = np.full((7, max(weeknumber_of_dates) + 1), np.nan)
+    z[np.asarray(weekdays_in_year, dtype=int), np.asarray(weeknumber_of_dates)] = 0
+    return go.Heatmap(
+        z=z,
+        xgap=gap,
+        ygap=gap,
+        showscale=False,
+        colorscale=[[0, color], [1, color]],
+        hoverinfo="skip",
+        name=BACKGROUND_NAME,
+    )
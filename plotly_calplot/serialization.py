@@ -0,0 +1,259 @@
+import gzip
+import hashlib
+import json
+import os
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from plotly import graph_objects as go
+
+# columns named by these parameters are read from data as well as x and y
+COLUMN_PARAMETERS = ("text", "group", "entity")
+HASH_BLOCK_SIZE = 1 << 20
+COMPRESSIONS = ("gzip", "brotli")
+
+
+def _get_figure_dict(fig: "go.Figure") -> Dict[str, Any]:
+    figure: Dict[str, Any] = fig.to_plotly_json()
+    for trace in figure["data"]:
+        trace.pop("uid", None)
+    return figure
+
+
+def _iter_json_pieces(
+    figure: Dict[str, Any], encode: Callable[[Any], bytes]
+) -> Iterator[bytes]:
+    # encodes the traces one at a time, the pieces joined are the encoding of
+    # the whole figure with sorted keys
+    for index, key in enumerate(sorted(figure)):
+        yield (b"{" if index == 0 else b",") + encode(key) + b":"
+        if key == "data":
+            for trace_index, trace in enumerate(figure[key]):
+                yield (b"[" if trace_index == 0 else b",") + encode(trace)
+            yield b"]" if figure[key] else b"[]"
+        else:
+            yield encode(figure[key])
+    yield b"}" if figure else b"{}"
+
+
+def _iter_canonical_json(fig: "go.Figure") -> Iterator[bytes]:
+    from _plotly_utils.utils import PlotlyJSONEncoder
+
+    encoder = PlotlyJSONEncoder(sort_keys=True, separators=(",", ":"))
+    return _iter_json_pieces(
+        _get_figure_dict(fig), lambda value: encoder.encode(value).encode("utf-8")
+    )
+
+
+def to_canonical_json(fig: "go.Figure") -> str:
+    """
+    Serializes a figure to compact JSON with sorted keys and without trace
+    uids, so identical figures give identical bytes whatever order their
+    layout was updated in. Floats are written with Python's shortest repr,
+    which round trips, and NaN as null.
+
+    Parameters:
+        fig (go.Figure): The figure to serialize.
+
+    Returns:
+        str: The canonical JSON of the figure.
+    """
+    return b"".join(_iter_canonical_json(fig)).decode("utf-8")
+
+
+def _orjson_default(value: Any) -> Any:
+    import numpy as np
+    from _plotly_utils.utils import PlotlyJSONEncoder
+
+    # orjson only takes contiguous arrays of numbers, strings and dates are
+    # left for tolist
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return PlotlyJSONEncoder().default(value)
+
+
+def _iter_json_bytes(fig: "go.Figure") -> Iterator[bytes]:
+    try:
+        import orjson
+    except ImportError:
+        return _iter_canonical_json(fig)
+    options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS
+    return _iter_json_pieces(
+        _get_figure_dict(fig),
+        lambda value: orjson.dumps(value, default=_orjson_default, option=options),
+    )
+
+
+def to_json_bytes(fig: "go.Figure") -> bytes:
+    """
+    The canonical JSON of to_canonical_json as UTF-8 bytes, encoded with
+    orjson when it is installed, which writes NumPy arrays directly instead
+    of going through Python lists. Without orjson it falls back to
+    to_canonical_json. Both give the same JSON document, but floats may be
+    spelled differently, e.g. 1e+16 and 1e16, so the bytes depend on whether
+    orjson is installed: hash or compare to_canonical_json instead.
+
+    Parameters:
+        fig (go.Figure): The figure to serialize.
+
+    Returns:
+        bytes: The JSON of the figure.
+    """
+    return b"".join(_iter_json_bytes(fig))
+
+
+def write_figure_json(
+    fig: "go.Figure",
+    file: IO[bytes],
+    compression: Optional[str] = None,
+    fast: bool = False,
+) -> None:
+    """
+    Writes the JSON of the figure to a binary file-like object, such as an
+    open file or a response stream, compressing it on the way when
+    compression is given. The figure is encoded and written one trace at a
+    time, so the JSON of the whole figure is never held in memory. By
+    default it writes to_canonical_json, whose bytes are the same in every
+    environment, and gzip output has no timestamp, so files can be compared
+    or cached by their content.
+
+    Parameters:
+        fig (go.Figure): The figure to write.
+        file (IO[bytes]): Where to write it, it is left open.
+        compression (Optional[str]): "gzip", "brotli" or None. brotli needs
+            the brotli extra.
+        fast (bool): Write the JSON of to_json_bytes instead, quicker when
+            orjson is installed but only stable within one environment.
+
+    Raises:
+        ValueError: If compression is unknown.
+        ImportError: If compression is "brotli" and brotli isn't installed.
+    """
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"compression must be one of {COMPRESSIONS} or None")
+    pieces = _iter_json_bytes(fig) if fast else _iter_canonical_json(fig)
+    if compression is None:
+        for piece in pieces:
+            file.write(piece)
+    elif compression == "gzip":
+        with gzip.GzipFile(fileobj=file, mode="wb", mtime=0) as gzip_file:
+            for piece in pieces:
+                gzip_file.write(piece)
+    else:
+        try:
+            import brotli
+        except ImportError:
+            raise ImportError(
+                "brotli compression requires brotli, install it with `pip install plotly_calplot[brotli]`"  # noqa
+            )
+        compressor = brotli.Compressor()
+        for piece in pieces:
+            file.write(compressor.process(piece))
+        file.write(compressor.finish())
+
+
+def _hash_frame_columns(frame: "pd.DataFrame", columns: List[str]) -> Iterable[bytes]:
+    import pandas as pd
+
+    for column in columns:
+        values = frame[column].to_numpy()
+        yield f"{column}:{values.dtype}:{len(values)}".encode()
+        if values.dtype.kind == "O":
+            # objects have no stable bytes, pandas hashes them by value
+            values = pd.util.hash_array(values)
+        yield values.tobytes()
+
+
+def _hash_file(path: Union[str, "os.PathLike[str]"]) -> Iterable[bytes]:
+    with open(path, "rb") as input_file:
+        while True:
+            block = input_file.read(HASH_BLOCK_SIZE)
+            if not block:
+                return
+            yield block
+
+
+def _get_package_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("plotly_calplot")
+    except PackageNotFoundError:
+        # running from a source checkout
+        from plotly_calplot import __version__
+
+        return __version__
+
+
+def get_input_hash(data: Any, x: str, y: str, **params: Any) -> str:
+    """
+    A hash of the inputs of a plot, cheap next to rendering it, to be used
+    as an HTTP ETag: the same data and parameters give the same hash and,
+    since the output is deterministic, the same figure. Only the columns
+    the plot reads are hashed, plus the versions of plotly_calplot and
+    plotly, which could change the output for the same inputs.
+
+    Parameters:
+        data: The DataFrame, the daily Series, the (dates, values) pair or
+            the path of the CSV or Parquet file that would be given to the
+            plot function.
+        x (str): The name of the date column.
+        y (str): The name of the value column.
+        **params: Every other argument of the plot function, the function's
+            name included, e.g. kind="calplot", dark_theme=True.
+
+    Returns:
+        str: Hexadecimal blake2b digest of the inputs.
+
+    Raises:
+        TypeError: If data is a chunk iterable, those can't be hashed
+            without consuming them.
+    """
+    import pandas as pd
+    import plotly
+
+    from plotly_calplot.paging import _get_dates_and_values, _is_array_pair
+
+    digest = hashlib.blake2b(digest_size=20)
+    header: Dict[str, Any] = {
+        "versions": [_get_package_version(), plotly.__version__],
+        "x": x,
+        "y": y,
+        "params": params,
+    }
+    digest.update(json.dumps(header, sort_keys=True, default=repr).encode())
+
+    if isinstance(data, pd.DataFrame):
+        columns = [x, y] + [
+            params[name] for name in COLUMN_PARAMETERS if params.get(name) is not None
+        ]
+        blocks = _hash_frame_columns(data, columns)
+    elif isinstance(data, pd.Series) or _is_array_pair(data):
+        # hashed as the frame the plot builds from them
+        dates, values = _get_dates_and_values(data)
+        frame = pd.DataFrame({x: dates, y: values})
+        blocks = _hash_frame_columns(frame, [x, y])
+    elif isinstance(data, (str, os.PathLike)):
+        blocks = _hash_file(data)
+    else:
+        raise TypeError(
+            "Only DataFrames, Series, (dates, values) pairs and file paths can"
+            " be hashed"
+        )
+    for block in blocks:
+        digest.update(block)
+    return digest.hexdigest()
@@ -1,15 +1,24 @@
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 from pandas.core.frame import DataFrame
 from plotly import graph_objects as go
 
-from plotly_calplot.date_extractors import get_date_coordinates, get_month_names
+from plotly_calplot.date_extractors import (
+    get_date_coordinates,
+    get_month_names,
+    get_sparse_padding,
+)
 from plotly_calplot.layout_formatter import (
+    apply_shared_layout,
     create_month_lines,
     decide_layout,
     update_plot_with_current_layout,
 )
-from plotly_calplot.raw_heatmap import create_heatmap_without_formatting
+from plotly_calplot.raw_heatmap import (
+    create_background_heatmap,
+    create_heatmap_without_formatting,
+)
+from plotly_calplot.utils import get_year_date_range
 
 
 def year_calplot(
@@ -33,44 +42,129 @@ def year_calplot(
     years_as_columns: bool = False,
     start_month: int = 1,
     end_month: int = 12,
+    shared_layout: bool = True,
+    sparse: bool = False,
+    coloraxis: Optional[str] = None,
 ) -> go.Figure:
     """
-    Each year is subplotted separately and added to the main plot
+    Each year is subplotted separately and added to the main plot,
+    if shared_layout is False the settings common to every year are
+    left for the caller to apply once with apply_shared_layout.
+    If sparse is True data holds only the observed days instead of
+    the whole year. If coloraxis is given the heatmap takes its colors
+    from that layout coloraxis, set by the caller
     """
+    cplt, layout = get_year_traces(
+        data,
+        x,
+        y,
+        year,
+        name=name,
+        dark_theme=dark_theme,
+        month_lines_width=month_lines_width,
+        month_lines_color=month_lines_color,
+        gap=gap,
+        colorscale=colorscale,
+        title=title,
+        month_lines=month_lines,
+        text=text,
+        text_name=text_name,
+        start_month=start_month,
+        end_month=end_month,
+        sparse=sparse,
+        coloraxis=coloraxis,
+    )
+    fig = update_plot_with_current_layout(fig, cplt, row, layout, years_as_columns)
+    if shared_layout:
+        fig = apply_shared_layout(fig, layout, total_height)
 
-    month_names = get_month_names(data, x, start_month, end_month)
+    return fig
+
+
+def get_year_traces(
+    data: DataFrame,
+    x: str,
+    y: str,
+    year: int,
+    name: str = "y",
+    dark_theme: bool = False,
+    month_lines_width: int = 1,
+    month_lines_color: str = "#9e9e9e",
+    gap: int = 1,
+    colorscale: str = "greens",
+    title: str = "",
+    month_lines: bool = True,
+    text: Optional[List[str]] = None,
+    text_name: Optional[str] = None,
+    start_month: int = 1,
+    end_month: int = 12,
+    sparse: bool = False,
+    coloraxis: Optional[str] = None,
+) -> Tuple[List[go.Figure], go.Layout]:
+    """
+    The traces of a year and the layout of its subplot, without adding
+    them to any figure, so that they can be built apart from it
+    """
+    calendar = data
+    if sparse:
+        calendar = DataFrame({x: get_year_date_range(year, start_month, end_month)})
+
+    month_names = get_month_names(calendar, x, start_month, end_month)
     month_positions, weekdays_in_year, weeknumber_of_dates = get_date_coordinates(
-        data, x
+        calendar, x
     )
 
+    if sparse:
+        # only the observed days go to the heatmap, drawn over a static grid
+        _, data_weekdays, data_weeknumbers = get_date_coordinates(data, x)
+        pad_weeks, pad_weekdays = get_sparse_padding(
+            data_weeknumbers, data_weekdays, weeknumber_of_dates
+        )
+        padding = len(pad_weeks)
+        heatmap_data = data.reset_index(drop=True)
+        heatmap_data.index += padding
+        heatmap_data = heatmap_data.reindex(range(padding + len(data)))
+        heatmap_weeknumbers = pad_weeks + data_weeknumbers
+        heatmap_weekdays = pad_weekdays + data_weekdays
+        if text is not None:
+            text = [""] * padding + list(text)
+    else:
+        heatmap_data = data
+        heatmap_weeknumbers = weeknumber_of_dates
+        heatmap_weekdays = weekdays_in_year
+
     # the calendar is actually a heatmap :)
     cplt = create_heatmap_without_formatting(
-        data,
+        heatmap_data,
         x,
         y,
-        weeknumber_of_dates,
-        weekdays_in_year,
+        heatmap_weeknumbers,
+        heatmap_weekdays,
         gap,
         year,
         colorscale,
         name,
         text=text,
         text_name=text_name,
+        hoverongaps=False if sparse else None,
+        coloraxis=coloraxis,
     )
+    if sparse:
+        cplt = [
+            create_background_heatmap(
+                weeknumber_of_dates, weekdays_in_year, gap, dark_theme
+            )
+        ] + cplt
 
     if month_lines:
         cplt = create_month_lines(
             cplt,
             month_lines_color,
             month_lines_width,
-            data[x],
+            calendar[x],
             weekdays_in_year,
             weeknumber_of_dates,
         )
 
     layout = decide_layout(dark_theme, title, month_names, month_positions)
-    fig = update_plot_with_current_layout(
-        fig, cplt, row, layout, total_height, years_as_columns
-    )
-
-    return fig
+    return cplt, layout
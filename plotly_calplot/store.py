@@ -0,0 +1,336 @@
+import json
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from plotly_calplot.utils import ISO_DATE_FMT, validate_date_column
+
+META_FILE = "meta.json"
+LOCK_FILE = "write.lock"
+# the cells a writer is about to change, left behind if it crashes
+PENDING_FILE = "pending.json"
+# a new values file has room for at least this many series and days
+MIN_SERIES_CAPACITY = 4
+MIN_DAYS_CAPACITY = 366
+REFRESH_ATTEMPTS = 8
+REFRESH_BACKOFF = 0.005
+
+
+@contextmanager
+def _exclusive_lock(path: str) -> Iterator[None]:
+    """
+    Holds an exclusive lock on the file at path, shared by every process
+    and every DailyStore writing to the same store
+    """
+    with open(path, "a+b") as lock_file:
+        if sys.platform == "win32":
+            import msvcrt
+
+            lock_file.seek(0)
+            # LK_LOCK retries for 10 seconds before raising OSError
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class DailyStore:
+    """
+    Per day aggregates of many series kept in a memory-mapped NumPy file,
+    one row per series and one column per day from first_day on.
+
+    The values are double buffered in two files with room for more series
+    and days than they hold. A write changes the cells of its days in the
+    buffer readers don't map and then swaps meta.json, which tells which
+    buffer is current and which part of it holds data, with an atomic
+    rename. A write is therefore seen whole or not at all, also when the
+    writer crashes, and only touches the cells it changes, plus those of
+    the previous write that the other buffer is missing. When the buffers
+    are full both are replaced by larger ones. Writers take an exclusive
+    file lock and refresh before writing, so writers in several processes
+    don't lose each other's updates.
+
+    Readers, even in other processes, keep the version they mapped through
+    the next write; the one after it reuses their buffer, so they should
+    refresh before every read, which only maps the current buffer.
+
+    Parameters:
+        path (str): Directory of the store, created on the first write.
+        readonly (bool): Open without write access, the store must exist.
+    """
+
+    def __init__(
+        self, path: Union[str, "os.PathLike[str]"], readonly: bool = False
+    ) -> None:
+        self.path = os.fspath(path)
+        self.readonly = readonly
+        self.series: List[str] = []
+        self.first_day = 0
+        self.values: npt.NDArray[np.float64] = np.full((0, 0), np.nan)
+        self._meta: Optional[Dict[str, Any]] = None
+        if readonly and not os.path.exists(self._meta_path):
+            raise FileNotFoundError(f"No daily store found at {self.path}")
+        self.refresh()
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.path, META_FILE)
+
+    @property
+    def _pending_path(self) -> str:
+        return os.path.join(self.path, PENDING_FILE)
+
+    @property
+    def days(self) -> npt.NDArray[np.datetime64]:
+        """
+        datetime64[D] date of every column of values
+        """
+        return np.arange(self.first_day, self.first_day + self.values.shape[1]).astype(
+            "datetime64[D]"
+        )
+
+    def refresh(self) -> None:
+        """
+        Maps the latest version of the store
+
+        Raises:
+            TimeoutError: If the values files kept being replaced by writers
+                while reading them.
+        """
+        for attempt in range(REFRESH_ATTEMPTS):
+            if not os.path.exists(self._meta_path):
+                return
+            with open(self._meta_path) as meta_file:
+                meta = json.load(meta_file)
+            try:
+                mapped = self._load(meta, meta["active"], "r")
+            except FileNotFoundError:
+                # a writer replaced the buffers meanwhile, read the new ones
+                time.sleep(REFRESH_BACKOFF * 2**attempt)
+                continue
+            start = meta["first_day"] - meta["file_first_day"]
+            stop = start + meta["days"]
+            self.series = meta["series"]
+            self.first_day = meta["first_day"]
+            self.values = mapped[: len(self.series), start:stop]
+            self._meta = meta
+            return
+        raise TimeoutError(f"Could not read a stable version of {self.path}")
+
+    def frame(self, series: str, x: str = "date", y: str = "value") -> pd.DataFrame:
+        """
+        DataFrame of one series ready for calplot, its value column is a
+        view of the mapped file rather than a copy
+        """
+        return pd.DataFrame(
+            {
+                x: self.days.astype("datetime64[ns]"),
+                y: self.values[self.series.index(series)],
+            },
+            copy=False,
+        )
+
+    def add(self, series: str, dates: Any, values: Any) -> None:
+        """
+        Adds the values of new events to the daily totals of series, events
+        falling on the same day are summed and events without a date or a
+        value are skipped
+        """
+        self._write(series, dates, values, accumulate=True)
+
+    def upsert(self, series: str, dates: Any, values: Any) -> None:
+        """
+        Sets the daily values of series, when a day repeats the last value
+        wins, a NaN value clears the day and rows without a date are skipped
+        """
+        self._write(series, dates, values, accumulate=False)
+
+    def _write(self, series: str, dates: Any, values: Any, accumulate: bool) -> None:
+        if self.readonly:
+            raise PermissionError("The daily store was opened as readonly")
+        days = validate_date_column(pd.Series(dates), ISO_DATE_FMT).to_numpy()
+        new_values = np.asarray(values, dtype=float)
+        keep = ~np.isnat(days)
+        if accumulate:
+            keep &= ~np.isnan(new_values)
+        ordinals = days[keep].astype("datetime64[D]").astype(np.int64)
+        new_values = new_values[keep]
+        if not len(ordinals):
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+        with _exclusive_lock(os.path.join(self.path, LOCK_FILE)):
+            # another writer may have written since this store was mapped
+            self.refresh()
+            meta = self._get_grown_meta(
+                series, int(ordinals.min()), int(ordinals.max())
+            )
+            previous_files = self._meta["values_files"] if self._meta else None
+            target = self._open_target(meta)
+            row_index = meta["series"].index(series)
+            offsets = ordinals - meta["file_first_day"]
+            touched, positions = np.unique(offsets, return_inverse=True)
+            self._write_pending(meta, row_index, touched)
+
+            row = target[row_index]
+            if accumulate:
+                sums = np.bincount(positions, weights=new_values)
+                row[touched] = np.nan_to_num(row[touched]) + sums
+            else:
+                row[offsets] = new_values
+            target.flush()
+            del target, row
+
+            meta["active"] = 1 - meta["active"]
+            meta["last_write"] = [row_index, touched.tolist()]
+            self._swap_meta(meta, previous_files)
+            os.remove(self._pending_path)
+
+    def _load(self, meta: Dict[str, Any], buffer: int, mode: Literal["r", "r+"]) -> Any:
+        path = os.path.join(self.path, meta["values_files"][buffer])
+        return np.load(path, mmap_mode=mode)
+
+    def _get_grown_meta(
+        self, series: str, first_day: int, last_day: int
+    ) -> Dict[str, Any]:
+        """
+        The meta of the store once it covers series and the days from
+        first_day to last_day, on the current buffers when they have room
+        """
+        if self._meta is None:
+            return {
+                "series": [series],
+                "first_day": first_day,
+                "days": last_day - first_day + 1,
+                "file_first_day": first_day,
+                "values_files": None,
+                "active": 0,
+                "last_write": None,
+            }
+        meta = dict(self._meta)
+        if series not in meta["series"]:
+            meta["series"] = meta["series"] + [series]
+        current_last_day = meta["first_day"] + meta["days"] - 1
+        meta["first_day"] = min(first_day, meta["first_day"])
+        meta["days"] = max(last_day, current_last_day) - meta["first_day"] + 1
+        return meta
+
+    def _open_target(self, meta: Dict[str, Any]) -> Any:
+        """
+        Maps for writing the buffer of meta that isn't active, once it holds
+        the same values as the active one. When the buffers have no room for
+        the series and days of meta, two files with twice the room are
+        written first, holding the current values, and meta is pointed to
+        them.
+        """
+        if meta["values_files"] is not None:
+            active = self._load(meta, meta["active"], "r")
+            rows, columns = active.shape
+            start = meta["first_day"] - meta["file_first_day"]
+            if len(meta["series"]) <= rows and 0 <= start <= columns - meta["days"]:
+                target = self._load(meta, 1 - meta["active"], "r+")
+                self._sync_buffer(meta, active, target)
+                return target
+            del active
+        else:
+            rows, columns = 0, 0
+
+        rows, columns, file_first_day = self._get_capacity(meta, rows, columns)
+        start = self.first_day - file_first_day
+        stop = start + self.values.shape[1]
+        values_files = []
+        for _ in range(2):
+            values_files.append(f"values-{uuid.uuid4().hex}.npy")
+            buffer = np.lib.format.open_memmap(  # type: ignore[no-untyped-call]
+                os.path.join(self.path, values_files[-1]),
+                mode="w+",
+                dtype=np.float64,
+                shape=(rows, columns),
+            )
+            buffer[:] = np.nan
+            buffer[: len(self.series), start:stop] = self.values
+            buffer.flush()
+        meta.update(
+            file_first_day=file_first_day,
+            values_files=values_files,
+            active=0,
+            last_write=None,
+        )
+        return buffer
+
+    def _sync_buffer(self, meta: Dict[str, Any], active: Any, target: Any) -> None:
+        """
+        Copies to the target buffer the cells it doesn't share with the
+        active one: those of the last write, which went to the active
+        buffer, and those of a write that crashed before swapping meta
+        """
+        writes = [meta["last_write"]]
+        if os.path.exists(self._pending_path):
+            with open(self._pending_path) as pending_file:
+                pending = json.load(pending_file)
+            # a crash while growing leaves cells of buffers no longer used
+            if pending["values_files"] == meta["values_files"]:
+                writes.append(pending["write"])
+        for row_index, offsets in filter(None, writes):
+            target[row_index, offsets] = active[row_index, offsets]
+
+    def _write_pending(
+        self, meta: Dict[str, Any], row_index: int, offsets: npt.NDArray[np.int64]
+    ) -> None:
+        pending = {
+            "values_files": meta["values_files"],
+            "write": [row_index, offsets.tolist()],
+        }
+        with open(self._pending_path, "w") as pending_file:
+            json.dump(pending, pending_file)
+            pending_file.flush()
+            os.fsync(pending_file.fileno())
+
+    def _get_capacity(
+        self, meta: Dict[str, Any], rows: int, columns: int
+    ) -> Tuple[int, int, int]:
+        """
+        Rows, columns and first day of new buffers with room to grow, the
+        spare days go on the side the store is growing towards
+        """
+        rows = max(2 * rows, len(meta["series"]), MIN_SERIES_CAPACITY)
+        columns = max(2 * columns, meta["days"], MIN_DAYS_CAPACITY)
+        file_first_day = meta["first_day"]
+        if self._meta is not None and meta["first_day"] < self._meta["first_day"]:
+            file_first_day -= columns - meta["days"]
+        return rows, columns, file_first_day
+
+    def _swap_meta(
+        self, meta: Dict[str, Any], previous_files: Optional[List[str]]
+    ) -> None:
+        temporary_meta_path = f"{self._meta_path}.{uuid.uuid4().hex}.tmp"
+        with open(temporary_meta_path, "w") as meta_file:
+            json.dump(meta, meta_file)
+            meta_file.flush()
+            os.fsync(meta_file.fileno())
+        os.replace(temporary_meta_path, self._meta_path)
+        self.refresh()
+        if previous_files and previous_files != meta["values_files"]:
+            for values_file in previous_files:
+                try:
+                    # readers that still map it keep it alive until they let go
+                    os.remove(os.path.join(self.path, values_file))
+                except OSError:
+                    pass
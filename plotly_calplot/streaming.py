@@ -0,0 +1,158 @@
+import os
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from plotly_calplot.utils import validate_date_column
+
+DEFAULT_CHUNKSIZE = 1_000_000
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+ChunkSource = Union[str, "os.PathLike[str]", Iterable[pd.DataFrame]]
+FrameSource = Union[pd.DataFrame, ChunkSource]
+# a Series indexed by date or a (dates, values) pair of arrays are daily data
+DailySource = Union["pd.Series[Any]", Tuple[Any, Any]]
+CalplotSource = Union[FrameSource, DailySource]
+
+
+def read_chunks(
+    path: Union[str, "os.PathLike[str]"],
+    columns: List[str],
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads the columns of a CSV or Parquet file in chunks of chunksize rows.
+    Parquet files are read with pyarrow, which has to be installed.
+    """
+    if str(path).lower().endswith(PARQUET_SUFFIXES):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "Reading Parquet files requires pyarrow, install it with `pip install pyarrow`"  # noqa
+            )
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+
+
+class DailyAggregator:
+    """
+    Running per day sums of values, kept in arrays indexed by day ordinal
+    that grow to cover the days seen so far. Memory depends on the span of
+    the calendar, not on the amount of rows added.
+    """
+
+    def __init__(self) -> None:
+        self.first_day: Optional[int] = None
+        self.sums: npt.NDArray[np.float64] = np.zeros(0)
+        self.counts: npt.NDArray[np.int64] = np.zeros(0, dtype=np.int64)
+
+    def _cover(self, first_day: int, last_day: int) -> None:
+        if self.first_day is None:
+            self.first_day = first_day
+        new_first = min(first_day, self.first_day)
+        new_size = max(last_day, self.first_day + len(self.sums) - 1) - new_first + 1
+        if new_first == self.first_day and new_size == len(self.sums):
+            return
+        shift = self.first_day - new_first
+        sums = np.zeros(new_size)
+        counts = np.zeros(new_size, dtype=np.int64)
+        stop = shift + len(self.sums)
+        sums[shift:stop] = self.sums
+        counts[shift:stop] = self.counts
+        self.first_day, self.sums, self.counts = new_first, sums, counts
+
+    def add(
+        self, days: npt.NDArray[np.datetime64], values: npt.NDArray[np.float64]
+    ) -> None:
+        """
+        Adds the values of the datetime64[D] days, rows with a missing date
+        or value are skipped like in pandas' sum
+        """
+        ordinals = days.astype(np.int64)
+        keep = ~np.isnat(days) & ~np.isnan(values)
+        ordinals, values = ordinals[keep], values[keep]
+        if not len(ordinals):
+            return
+        self._cover(int(ordinals.min()), int(ordinals.max()))
+        assert self.first_day is not None
+        offsets = ordinals - self.first_day
+        self.sums += np.bincount(offsets, weights=values, minlength=len(self.sums))
+        self.counts += np.bincount(offsets, minlength=len(self.counts))
+
+    def to_frame(self, x: str, y: str) -> pd.DataFrame:
+        """
+        The days with at least one value and their sums
+        """
+        observed = np.flatnonzero(self.counts)
+        first_day = self.first_day or 0
+        days = (observed + first_day).astype("datetime64[D]")
+        return pd.DataFrame({x: days.astype("datetime64[ns]"), y: self.sums[observed]})
+
+
+def aggregate_daily(
+    source: ChunkSource,
+    x: str,
+    y: str,
+    date_fmt: str = "%Y-%m-%d",
+    date_unit: Optional[str] = None,
+    dedupe: bool = False,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> pd.DataFrame:
+    """
+    Reduces a CSV/Parquet path or an iterable of DataFrame chunks to one row
+    per day with the sum of its values, one chunk at a time.
+
+    Parameters:
+        source: The path of a CSV or Parquet file, or an iterable of chunks.
+        x (str): The name of the date column.
+        y (str): The name of the value column.
+        date_fmt (str): The format used to parse string dates.
+        date_unit (Optional[str]): Epoch unit of numeric date columns.
+        dedupe (bool): Parse each distinct date string only once.
+        chunksize (int): Rows per chunk when reading a file.
+
+    Returns:
+        pd.DataFrame: The daily sums, sorted by day.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        chunks: Iterable[pd.DataFrame] = read_chunks(source, [x, y], chunksize)
+    else:
+        chunks = source
+
+    aggregator = DailyAggregator()
+    for chunk in chunks:
+        dates = validate_date_column(chunk[x], date_fmt, date_unit, dedupe=dedupe)
+        aggregator.add(
+            dates.to_numpy().astype("datetime64[D]"),
+            # nullable Int64/Float64 columns, as read from parquet, hold pd.NA
+            chunk[y].to_numpy(dtype=float, na_value=np.nan),
+        )
+    return aggregator.to_frame(x, y)
+
+
+def as_frame(
+    data: FrameSource,
+    x: str,
+    y: str,
+    date_fmt: str = "%Y-%m-%d",
+    date_unit: Optional[str] = None,
+    dedupe: bool = False,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    text: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Returns DataFrames as they are and reduces paths and chunk iterables to
+    their daily sums with aggregate_daily. The text column can't be summed,
+    so it is only accepted with DataFrames.
+    """
+    if isinstance(data, pd.DataFrame):
+        return data
+    if text is not None:
+        raise ValueError("text can't be used when data is read in chunks")
+    return aggregate_daily(data, x, y, date_fmt, date_unit, dedupe, chunksize)
@@ -1,8 +1,35 @@
 from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
+from pandas.api.types import (
+    is_datetime64_any_dtype,
+    is_numeric_dtype,
+    is_object_dtype,
+    is_string_dtype,
+)
 from pandas.core.frame import DataFrame
 
+ISO_DATE_FMT = "%Y-%m-%d"
+
+
+def get_year_date_range(
+    year: int, start_month: int, end_month: int
+) -> pd.DatetimeIndex:
+    """
+    Every date of the year from the first day of start_month to the last
+    day of end_month.
+    """
+    if end_month != 12:
+        last_date = datetime(year, end_month + 1, 1) + timedelta(days=-1)
+    else:
+        last_date = datetime(year, 1, 1) + timedelta(days=-1)
+    year_min_date = date(year=year, month=start_month, day=1)
+    year_max_date = date(year=year, month=end_month, day=last_date.day)
+    return pd.date_range(year_min_date, year_max_date)
+
 
 def fill_empty_with_zeros(
     selected_year_data: DataFrame,
@@ -24,44 +51,346 @@ def fill_empty_with_zeros(
     Returns:
         pd.DataFrame: The final DataFrame with empty dates filled with zeros.
     """
-    if end_month != 12:
-        last_date = datetime(year, end_month + 1, 1) + timedelta(days=-1)
-    else:
-        last_date = datetime(year, 1, 1) + timedelta(days=-1)
-    year_min_date = date(year=year, month=start_month, day=1)
-    year_max_date = date(year=year, month=end_month, day=last_date.day)
-    df = pd.DataFrame({x: pd.date_range(year_min_date, year_max_date)})
+    df = pd.DataFrame({x: get_year_date_range(year, start_month, end_month)})
     final_df = df.merge(selected_year_data, how="left")
     return final_df
 
 
-def validate_date_column(date_column: pd.Series, date_fmt: str) -> pd.Series:
+def get_entity_day_matrix(
+    entity_codes: npt.NDArray[np.intp],
+    days: npt.NDArray[np.datetime64],
+    values: npt.NDArray[np.float64],
+    n_entities: int,
+    calendar: pd.DatetimeIndex,
+) -> npt.NDArray[np.float64]:
+    """
+    Places the values on a (n_entities, len(calendar)) matrix by entity code
+    and day offset, NaN where an entity has no data. Days outside the
+    calendar are dropped and when a day repeats for an entity the last
+    value wins, like in the heatmap traces.
+
+    Args:
+        entity_codes (np.ndarray): Integer code of each row, -1 is dropped.
+        days (np.ndarray): datetime64[D] date of each row.
+        values (np.ndarray): Value of each row.
+        n_entities (int): Amount of entity codes.
+        calendar (pd.DatetimeIndex): Consecutive days of the calendar.
+
+    Returns:
+        np.ndarray: The entity x day matrix.
+    """
+    first_day = np.datetime64(calendar[0].date(), "D")
+    offsets = (days - first_day).astype(np.int64)
+    inside = (offsets >= 0) & (offsets < len(calendar)) & (entity_codes >= 0)
+    matrix = np.full((n_entities, len(calendar)), np.nan)
+    matrix[entity_codes[inside], offsets[inside]] = values[inside]
+    return matrix
+
+
+def get_entity_month_matrix(
+    entity_codes: npt.NDArray[np.intp],
+    months: npt.NDArray[np.datetime64],
+    values: npt.NDArray[np.float64],
+    n_entities: int,
+) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.datetime64]]:
     """
-    Validate the date column from a DataFrame.
+    Sums the values on a (n_entities, months) matrix with a single bincount
+    on the combined entity and month code of each row, NaN where an entity
+    has no data in a month. Rows with a missing month or value are skipped.
+
+    Args:
+        entity_codes (np.ndarray): Integer code of each row, -1 is dropped.
+        months (np.ndarray): datetime64[M] month of each row.
+        values (np.ndarray): Value of each row.
+        n_entities (int): Amount of entity codes.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The entity x month matrix and the
+        datetime64[M] month of each of its columns, every month from the
+        first to the last one with data.
+    """
+    keep = (entity_codes >= 0) & ~np.isnat(months) & ~np.isnan(values)
+    ordinals = months[keep].astype(np.int64)
+    if not len(ordinals):
+        return np.full((n_entities, 0), np.nan), np.array([], dtype="datetime64[M]")
+    first_month = int(ordinals.min())
+    n_months = int(ordinals.max()) - first_month + 1
+
+    cells = entity_codes[keep] * n_months + (ordinals - first_month)
+    size = n_entities * n_months
+    sums = np.bincount(cells, weights=values[keep], minlength=size).astype(
+        np.float64, copy=False
+    )
+    sums[np.bincount(cells, minlength=size) == 0] = np.nan
+    month_range = np.arange(first_month, first_month + n_months)
+    return sums.reshape(n_entities, n_months), month_range.astype("datetime64[M]")
+
+
+def split_by_year(
+    dates: "pd.Series[Any]", start_month: int, end_month: int
+) -> Tuple[
+    npt.NDArray[np.datetime64], Optional[npt.NDArray[np.intp]], List[Tuple[int, slice]]
+]:
+    """
+    Sorts the dates by day and finds, for every year with data, the slice of
+    the sorted days that falls within the month range. The month range is
+    resolved with binary searches on the sorted days, so nothing is masked
+    or copied per year.
+
+    The whole input is allocated at most three times as an 8 bytes per row
+    array: the datetime64[D] day codes and, only when the dates aren't
+    sorted yet, the sort order and the sorted day codes. A 1 byte per row
+    NaT mask is the only other allocation. The caller reorders its value
+    columns with the same order, every per year array is then a view.
+
+    Args:
+        dates (pd.Series): Validated datetime64[ns] dates.
+        start_month (int): The starting month of the year.
+        end_month (int): The ending month of the year.
+
+    Returns:
+        Tuple: The sorted days, the sort order (None when the dates were
+        already sorted) and the (year, slice) of every year with data,
+        including years whose data is outside the month range.
+    """
+    days = dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    order = None
+    if not dates.is_monotonic_increasing:
+        order = np.argsort(days, kind="stable")
+        days = days[order]
+    return days, order, get_year_slices(days, start_month, end_month)
+
+
+def get_year_slices(
+    days: npt.NDArray[np.datetime64], start_month: int, end_month: int
+) -> List[Tuple[int, slice]]:
+    """
+    The (year, slice) of every year with data in sorted datetime64[D] days,
+    each slice covering the days within the month range, found with binary
+    searches.
+    """
+    year_slices: List[Tuple[int, slice]] = []
+    # NaT sorts last, so the valid days are a prefix of the sorted days
+    valid_days = int(np.isnat(days).searchsorted(True))
+    if not valid_days:
+        return year_slices
+
+    first_year, last_year = days[[0, valid_days - 1]].astype("datetime64[Y]")
+    year_starts = np.arange(first_year, last_year + 2)
+    bounds = np.searchsorted(days, year_starts.astype("datetime64[D]"))
+    for year_start, lower, upper in zip(year_starts, bounds[:-1], bounds[1:]):
+        if lower == upper:
+            continue
+        first_month = year_start.astype("datetime64[M]")
+        month_range = np.array([first_month + start_month - 1, first_month + end_month])
+        start, end = np.searchsorted(days, month_range.astype("datetime64[D]"))
+        year_slices.append((int(year_start.astype(int)) + 1970, slice(start, end)))
+    return year_slices
+
+
+def get_daily_days(dates: Any) -> Optional[npt.NDArray[np.datetime64]]:
+    """
+    The datetime64[D] days of dates when they are already clean daily
+    dates: datetime64, at midnight, strictly increasing and so unique, with
+    no NaT. None otherwise, then the dates need the validating path.
+    """
+    array = np.asarray(dates)
+    if array.dtype.kind != "M":
+        return None
+    days: npt.NDArray[np.datetime64] = array.astype("datetime64[D]")
+    if np.isnat(days).any() or (days != array).any():
+        return None
+    if (np.diff(days.astype(np.int64)) <= 0).any():
+        return None
+    return days
+
+
+def get_window_grid(
+    days: npt.NDArray[np.datetime64],
+    values: npt.NDArray[Any],
+    first_day: np.datetime64,
+    weekdays: npt.NDArray[np.int64],
+    week_columns: npt.NDArray[np.int64],
+    fill_value: Any = np.nan,
+) -> npt.NDArray[Any]:
+    """
+    Places the values of days on the weekday x week grid of a continuous
+    range of days, given by the coordinates of get_window_coordinates. Days
+    outside the range are left out and a day with several rows keeps the
+    last one, like a heatmap drawn from x/y/z columns.
+
+    Args:
+        days (np.ndarray): Sorted datetime64[D] days of the values.
+        values (np.ndarray): The values to place.
+        first_day (np.datetime64): The first day of the range.
+        weekdays (np.ndarray): The weekday of every day of the range.
+        week_columns (np.ndarray): The week column of every day of the range.
+        fill_value (Any): The value of the cells without data.
+
+    Returns:
+        np.ndarray: A 7 x weeks grid, float unless fill_value isn't a number.
+    """
+    offsets = (days - first_day).astype(np.int64)
+    inside = (offsets >= 0) & (offsets < len(weekdays))
+    dtype = float if isinstance(fill_value, float) else object
+    grid = np.full((7, int(week_columns[-1]) + 1), fill_value, dtype=dtype)
+    grid[weekdays[offsets[inside]], week_columns[offsets[inside]]] = values[inside]
+    return grid
+
+
+def split_columns_by_year(
+    dates: "pd.Series[Any]",
+    columns: Dict[str, npt.NDArray[Any]],
+    start_month: int,
+    end_month: int,
+) -> Tuple[
+    npt.NDArray[np.datetime64], Dict[str, npt.NDArray[Any]], List[Tuple[int, slice]]
+]:
+    """
+    split_by_year that also puts the columns in the order of the sorted days,
+    each column is copied only when the dates weren't sorted.
+    """
+    days, order, year_slices = split_by_year(dates, start_month, end_month)
+    if order is not None:
+        columns = {name: column[order] for name, column in columns.items()}
+    return days, columns, year_slices
+
+
+def fill_year_frame(
+    days: npt.NDArray[np.datetime64],
+    columns: Dict[str, npt.NDArray[Any]],
+    x: str,
+    year: int,
+    start_month: int,
+    end_month: int,
+    unique: bool = False,
+) -> pd.DataFrame:
+    """
+    Array counterpart of fill_empty_with_zeros, gives the same rows as its
+    merge: every date of the month range once, or once per row when it has
+    rows, with the empty dates left as NaN. When the days are known to be
+    unique the values are placed by day offset alone.
+
+    Args:
+        days (np.ndarray): Sorted datetime64[D] days of the year's rows.
+        columns (Dict[str, np.ndarray]): The columns to place, by name.
+        x (str): The column name for the date values.
+        year (int): The year for which the data is being filled.
+        start_month (int): The starting month of the year.
+        end_month (int): The ending month of the year.
+        unique (bool): The days have no repeats.
+
+    Returns:
+        pd.DataFrame: The year's rows with the empty dates filled.
+    """
+    calendar = get_year_date_range(year, start_month, end_month)
+    offsets = (days - np.datetime64(calendar[0].date(), "D")).astype(np.int64)
+    if unique:
+        positions = offsets
+        size = len(calendar)
+        frame: Dict[str, Any] = {x: calendar.values}
+    else:
+        repeats = np.maximum(np.bincount(offsets, minlength=len(calendar)), 1)
+        # a day with several rows takes that many consecutive positions, in
+        # the order the rows came in
+        day_starts = np.cumsum(repeats) - repeats
+        rank_in_day = np.arange(len(offsets)) - np.searchsorted(offsets, offsets)
+        positions = day_starts[offsets] + rank_in_day
+        size = int(repeats.sum())
+        frame = {x: np.repeat(calendar.values, repeats)}
+    for name, column in columns.items():
+        if len(column) == size:
+            # no empty dates, the column keeps its dtype like in the merge
+            filled = np.empty(size, dtype=column.dtype)
+        else:
+            dtype = float if column.dtype.kind in "biuf" else object
+            filled = np.full(size, np.nan, dtype=dtype)
+        filled[positions] = column
+        frame[name] = filled
+    return pd.DataFrame(frame)
+
+
+def _normalize_datetime_column(date_column: "pd.Series[Any]") -> "pd.Series[Any]":
+    """
+    Converts a datetime64 column of any unit, tz-aware or not, to tz-naive
+    datetime64[ns]. Tz-aware values keep their local wall time, so every
+    date lands on the calendar day it had in its own timezone.
+    """
+    if date_column.dt.tz is not None:
+        date_column = date_column.dt.tz_localize(None)
+    if date_column.dtype != "datetime64[ns]":
+        date_column = date_column.astype("datetime64[ns]")
+    return date_column
+
+
+def _parse_date_strings(
+    date_column: "pd.Series[Any]", date_fmt: str
+) -> "pd.Series[Any]":
+    """
+    Parses string dates with pandas' vectorized parsers, strictly in date_fmt.
+    pandas already takes its fast ISO path for the default "%Y-%m-%d", so
+    strings like "2023-01-05T10:00" or "20230105" are still rejected.
+    """
+    return pd.to_datetime(date_column, format=date_fmt)
+
+
+def _parse_unique_date_strings(
+    date_column: "pd.Series[Any]", date_fmt: str
+) -> "pd.Series[Any]":
+    """
+    Parses only the distinct strings of the column and maps the parsed dates
+    back through the factorized integer codes, so the parsing cost scales
+    with the amount of distinct dates instead of the amount of rows.
+    """
+    codes, uniques = pd.factorize(date_column)
+    parsed = _normalize_datetime_column(
+        _parse_date_strings(pd.Series(uniques), date_fmt)
+    ).to_numpy()
+    # missing values get the code -1, which takes the trailing NaT
+    parsed = np.append(parsed, np.datetime64("NaT", "ns"))
+    return pd.Series(parsed.take(codes), index=date_column.index, name=date_column.name)
+
+
+def validate_date_column(
+    date_column: "pd.Series[Any]",
+    date_fmt: str,
+    date_unit: Optional[str] = None,
+    dedupe: bool = False,
+) -> "pd.Series[Any]":
+    """
+    Validate the date column from a DataFrame and normalize it to tz-naive
+    datetime64[ns].
 
     Parameters:
-        data (DataFrame): The input DataFrame.
-        x (str): The name of the column containing the date values.
+        date_column (pd.Series): The date values.
+        date_fmt (str): The format used to parse string dates.
+        date_unit (Optional[str]): Epoch unit ("s", "ms", "us" or "ns") used
+            to read numeric columns. Numeric columns are rejected when None.
+        dedupe (bool): Parse each distinct date string only once, useful when
+            many rows share few dates.
 
     Returns:
-        pd.Series: The date column extracted from the DataFrame.
+        pd.Series: The normalized date column.
 
     Raises:
-        ValueError: If the column is not in datetime format.
+        ValueError: If the strings are not in the date_fmt format.
+        Exception: If the column can't be read as dates.
     """
-    if date_column.dtype == "datetime64[ns]":
-        return date_column
-    elif date_column.dtype == "object":
+    if is_datetime64_any_dtype(date_column):
+        return _normalize_datetime_column(date_column)
+    if date_unit is not None and is_numeric_dtype(date_column):
+        return pd.to_datetime(date_column, unit=date_unit)
+    if is_object_dtype(date_column) or is_string_dtype(date_column):
         try:
-            return pd.to_datetime(date_column, format=date_fmt)
+            if dedupe:
+                return _parse_unique_date_strings(date_column, date_fmt)
+            return _normalize_datetime_column(
+                _parse_date_strings(date_column, date_fmt)
+            )
         except ValueError:
             raise ValueError(
                 f"Date column is not in the {date_fmt} format. Use change date_fmt parameter to match your dates."  # noqa
             )
-    try:
-        if date_column.dt.tz is not None:
-            return date_column.dt.tz_localize(None)
-    except Exception as e:
-        raise Exception(
-            f"Exception {e}\nDate column is not in datetime format or not in the right string format. Please convert it to datetime format first or use the date_fmt parameter."  # noqa
-        )
+    raise Exception(
+        f"Date column of type {date_column.dtype} is not in datetime format or not in the right string format. Please convert it to datetime format first, use the date_fmt parameter or the date_unit parameter for epochs."  # noqa
+    )
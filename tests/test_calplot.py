@@ -1,10 +1,18 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import List, Union
 from unittest import TestCase
 
 import pandas as pd
 from plotly import graph_objects as go
 
-from plotly_calplot.calplot import calplot
+from plotly_calplot.calplot import (
+    calplot,
+    entity_calplot,
+    image_calplot,
+    month_calplot,
+    window_calplot,
+)
 
 
 class TestCalplot(TestCase):
@@ -67,3 +75,191 @@ class TestCalplot(TestCase):
         self.assertTrue(len(cp.data) == 236)
         self.assertTrue(type(cp.data) == tuple)
         self.assertTrue(type(cp) == go.Figure)
+
+    def test_should_create_sparse_calplot(self) -> None:
+        cp = calplot(self.multi_year_sample_dataframe, "ds", "value", sparse=True)
+        heatmaps = [t for t in cp.data if t.type == "heatmap"]
+
+        # one background grid and one data heatmap per year
+        self.assertEqual(len(heatmaps), 14)
+        self.assertEqual(heatmaps[0].name, "background")
+        self.assertEqual(heatmaps[1].name, "2019")
+        self.assertLess(len(heatmaps[1].z), 365)
+        observed = [z for z in heatmaps[1].z if z == z]
+        self.assertEqual(sorted(observed), [13, 16])
+
+    def test_should_share_one_coloraxis(self) -> None:
+        cp = calplot(
+            self.multi_year_sample_dataframe,
+            "ds",
+            "value",
+            sparse=True,
+            showscale=True,
+            colorscale="blues",
+        )
+        heatmaps = [t for t in cp.data if t.type == "heatmap"]
+
+        self.assertEqual(cp.layout.coloraxis.cmin, 0)
+        self.assertEqual(cp.layout.coloraxis.cmax, 29)
+        self.assertTrue(cp.layout.coloraxis.showscale)
+        for heatmap in heatmaps:
+            if heatmap.name == "background":
+                self.assertIsNone(heatmap.coloraxis)
+            else:
+                self.assertEqual(heatmap.coloraxis, "coloraxis")
+                self.assertIsNone(heatmap.colorscale)
+                self.assertIsNone(heatmap.zmax)
+
+    def test_should_create_image_calplot(self) -> None:
+        cp = image_calplot(self.multi_year_sample_dataframe, "ds", "value")
+
+        self.assertEqual(len(cp.data), 1)
+        self.assertEqual(cp.data[0].type, "image")
+        self.assertTrue(cp.data[0].source.startswith("data:image/png"))
+        self.assertEqual(len(cp.layout.yaxis.ticktext), 7)
+
+    def test_should_create_image_calplot_with_hover(self) -> None:
+        cp = image_calplot(
+            self.multi_year_sample_dataframe, "ds", "value", hover=True, cmap_max=10
+        )
+
+        self.assertEqual(cp.data[0].colormodel, "rgba")
+        self.assertEqual(len(cp.data[0].z), 7 * 8 - 1)
+        self.assertEqual(cp.data[0].hoverinfo, "text")
+
+    def test_should_create_image_calplot_without_values(self) -> None:
+        data = self.multi_year_sample_dataframe.assign(value=float("nan"))
+
+        for frame in [data, data.head(0)]:
+            cp = image_calplot(frame, "ds", "value", colorscale=["#fff", "red"])
+            self.assertEqual(cp.data[0].type, "image")
+
+    def test_should_create_entity_calplot(self) -> None:
+        data = pd.concat(
+            [
+                self.one_year_sample_dataframe.assign(host="b"),
+                self.one_year_sample_dataframe.assign(host="a"),
+            ]
+        )
+
+        cp = entity_calplot(data, "ds", "value", "host")
+
+        self.assertEqual(len(cp.data), 3)
+        self.assertEqual([t.name for t in cp.data[:2]], ["a", "b"])
+        self.assertEqual(len(cp.data[0].z), 365)
+        self.assertEqual(min(cp.data[1].y), 8)
+        self.assertEqual(cp.data[2].type, "scatter")
+        self.assertEqual(cp.layout.yaxis.ticktext, ("a", "b"))
+        self.assertEqual(cp.data[0].coloraxis, "coloraxis")
+        self.assertEqual(cp.layout.coloraxis.cmax, 29)
+
+    def test_should_create_single_trace_entity_calplot(self) -> None:
+        data = self.multi_year_sample_dataframe.assign(host=["a", "b"] * 5)
+
+        cp = entity_calplot(data, "ds", "value", "host", year=2024, single_trace=True)
+
+        self.assertEqual(len(cp.data), 2)
+        z = cp.data[0].z
+        self.assertEqual(len(z), 15)
+        # 2024-04-04 is b's Thursday on week 14, 2024-04-05 a's Friday
+        self.assertEqual(z[8 + 3][14], 13)
+        self.assertEqual(z[4][14], 23)
+
+    def test_should_create_calplot_from_daily_series(self) -> None:
+        dates = pd.date_range("2019-02-01", "2020-11-30", freq="2D")
+        series = pd.Series(range(len(dates)), index=dates, dtype=float)
+        expected = calplot(
+            pd.DataFrame({"x": dates, "y": series.to_numpy()}), "x", "y"
+        ).to_json()
+
+        self.assertEqual(calplot(series).to_json(), expected)
+        self.assertEqual(
+            calplot((dates.to_numpy(), series.to_numpy())).to_json(), expected
+        )
+        # unsorted series go through the validating path
+        self.assertEqual(calplot(series[::-1]).to_json(), expected)
+        with self.assertRaises(ValueError):
+            calplot(series, text="text")
+
+    def test_should_build_years_in_worker_processes(self) -> None:
+        data = self.multi_year_sample_dataframe.assign(
+            label=lambda frame: frame["value"].astype(str)
+        )
+        for sparse in [False, True]:
+            expected = calplot(data, "ds", "value", text="label", sparse=sparse)
+            cp = calplot(data, "ds", "value", text="label", sparse=sparse, n_jobs=2)
+
+            self.assertEqual(cp.to_json(), expected.to_json())
+
+    def test_should_create_window_calplot(self) -> None:
+        dates = pd.date_range("2020-01-01", "2021-06-30")
+        series = pd.Series(range(len(dates)), index=dates, dtype=float)
+
+        cp = window_calplot(series)
+
+        # one heatmap for the whole window and one trace of month lines
+        self.assertEqual([t.type for t in cp.data], ["heatmap", "scatter"])
+        z = cp.data[0].z
+        # the window starts on Wednesday 2020-07-01 and ends on a Wednesday
+        self.assertEqual(len(z[0]), 53)
+        self.assertEqual(z[2][0], series["2020-07-01"])
+        self.assertEqual(z[2][-1], series["2021-06-30"])
+        self.assertEqual(cp.data[0].customdata[2][-1], "2021-06-30")
+        self.assertEqual(cp.layout.xaxis.ticktext[6], "January 2021")
+        self.assertEqual(cp.layout.coloraxis.cmin, series["2020-07-01"])
+
+    def test_should_need_an_end_without_valid_dates(self) -> None:
+        empty = pd.DataFrame({"ds": pd.to_datetime([]), "value": []})
+        not_dated = pd.Series([1.0], index=pd.DatetimeIndex([pd.NaT]))
+
+        samples: List[Union[pd.DataFrame, "pd.Series[float]"]] = [empty, not_dated]
+        for data in samples:
+            with self.assertRaisesRegex(ValueError, "no valid dates"):
+                window_calplot(data, "ds", "value")
+        cp = window_calplot(empty, "ds", "value", end="2024-04-30", days=7)
+        self.assertEqual(cp.data[0].customdata[1][-1], "2024-04-30")
+
+    def test_should_create_window_calplot_with_text(self) -> None:
+        data = self.multi_year_sample_dataframe.assign(
+            label=lambda frame: frame["value"].astype(str)
+        )
+
+        cp = window_calplot(
+            data, "ds", "value", end="2024-04-30", days=60, text="label"
+        )
+
+        self.assertEqual(len(cp.data), 2)
+        self.assertIn("label=%{text}", cp.data[0].hovertemplate)
+        texts = [t for row in cp.data[0].text for t in row if t]
+        self.assertEqual(sorted(texts), ["13", "23"])
+        with self.assertRaises(ValueError):
+            window_calplot(data, "ds", "value", days=0)
+
+    def test_should_not_modify_data(self) -> None:
+        data = self.multi_year_sample_dataframe.assign(
+            ds=lambda frame: frame["ds"].dt.strftime("%Y-%m-%d"),
+            group=["a", "b"] * 5,
+        )
+        expected = data.copy()
+
+        calplot(data, "ds", "value", text="group")
+        month_calplot(data, "ds", "value")
+        month_calplot(data, "ds", "value", group="group")
+        window_calplot(data, "ds", "value")
+        entity_calplot(data, "ds", "value", "group")
+        image_calplot(data, "ds", "value")
+
+        pd.testing.assert_frame_equal(data, expected)
+
+    def test_should_render_shared_data_from_threads(self) -> None:
+        data = self.multi_year_sample_dataframe.assign(
+            ds=lambda frame: frame["ds"].dt.strftime("%Y-%m-%d")
+        )
+        expected = calplot(data.copy(), "ds", "value").to_json()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(lambda _: calplot(data, "ds", "value").to_json(), range(8))
+            )
+
+        self.assertEqual(results, [expected] * 8)
@@ -0,0 +1,110 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stderr
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from plotly_calplot.cli import expand_inputs, get_output_stems, main, parse_option
+from plotly_calplot.html_bundle import PLOTLYJS_FILE
+
+
+class TestCli(TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        dates = pd.date_range("2021-12-01", "2022-02-28")
+        for name in ["first", "second"]:
+            pd.DataFrame({"ds": dates, "value": np.arange(len(dates))}).to_csv(
+                os.path.join(self.tmp.name, f"{name}.csv"), index=False
+            )
+        self.output_dir = os.path.join(self.tmp.name, "out")
+
+    def test_should_parse_options_as_json_when_possible(self) -> None:
+        self.assertEqual(parse_option("dark_theme=true"), {"dark_theme": True})
+        self.assertEqual(parse_option("gap=3"), {"gap": 3})
+        self.assertEqual(parse_option("colorscale=blues"), {"colorscale": "blues"})
+
+    def test_should_expand_globs_without_repeating_files(self) -> None:
+        pattern = os.path.join(self.tmp.name, "*.csv")
+        first = os.path.join(self.tmp.name, "first.csv")
+        self.assertEqual(
+            expand_inputs([first, pattern]),
+            [first, os.path.join(self.tmp.name, "second.csv")],
+        )
+
+    def test_should_report_inputs_matching_no_file(self) -> None:
+        pattern = os.path.join(self.tmp.name, "*.parquet")
+        with self.assertRaisesRegex(FileNotFoundError, "no files matched"):
+            expand_inputs([pattern])
+        with redirect_stderr(io.StringIO()) as stderr, self.assertRaises(SystemExit):
+            main([pattern, "-x", "ds", "-y", "value", "-o", self.output_dir])
+        self.assertIn(f"no files matched {pattern}", stderr.getvalue())
+        self.assertFalse(os.path.exists(self.output_dir))
+
+    def test_should_name_outputs_after_the_path_below_the_common_folder(self) -> None:
+        first, second = os.path.join("a", "data.csv"), os.path.join(
+            "b", "c", "data.csv"
+        )
+        self.assertEqual(get_output_stems([first, second]), ["a_data", "b_c_data"])
+        other = os.path.join("a", "other.csv")
+        self.assertEqual(get_output_stems([first, other]), ["data", "other"])
+        with self.assertRaisesRegex(ValueError, "would both be written as data"):
+            get_output_stems([first, os.path.join("a", "data.parquet")])
+
+    def test_should_not_overwrite_outputs_of_inputs_with_the_same_name(self) -> None:
+        for folder, name in [("2021", "first"), ("2022", "second")]:
+            os.makedirs(os.path.join(self.tmp.name, folder))
+            os.replace(
+                os.path.join(self.tmp.name, f"{name}.csv"),
+                os.path.join(self.tmp.name, folder, "data.csv"),
+            )
+        pattern = os.path.join(self.tmp.name, "*", "data.csv")
+        argv = [pattern, "-x", "ds", "-y", "value", "-o", self.output_dir, "-j", "1"]
+        main(argv + ["--format", "json"])
+
+        self.assertEqual(
+            sorted(os.listdir(self.output_dir)), ["2021_data.json", "2022_data.json"]
+        )
+
+    def test_should_write_html_pages_sharing_one_plotlyjs(self) -> None:
+        pattern = os.path.join(self.tmp.name, "*.csv")
+        argv = [pattern, "-x", "ds", "-y", "value", "-o", self.output_dir, "-j", "1"]
+        self.assertEqual(main(argv + ["--option", "dark_theme=true"]), 0)
+
+        self.assertEqual(
+            sorted(os.listdir(self.output_dir)),
+            sorted(["first.html", "second.html", PLOTLYJS_FILE]),
+        )
+        with open(os.path.join(self.output_dir, "first.html")) as html_file:
+            html = html_file.read()
+        self.assertIn(f'<script src="{PLOTLYJS_FILE}"></script>', html)
+
+    def test_should_write_json_figures_with_worker_processes(self) -> None:
+        pattern = os.path.join(self.tmp.name, "*.csv")
+        main(
+            [pattern, "-x", "ds", "-y", "value", "-o", self.output_dir]
+            + ["--format", "json", "--kind", "month_calplot", "-j", "2"]
+        )
+
+        self.assertEqual(
+            sorted(os.listdir(self.output_dir)), ["first.json", "second.json"]
+        )
+        with open(os.path.join(self.output_dir, "second.json")) as json_file:
+            figure = json.load(json_file)
+        self.assertEqual(figure["data"][0]["type"], "heatmap")
+
+    def test_should_write_compressed_json(self) -> None:
+        path = os.path.join(self.tmp.name, "first.csv")
+        main(
+            [path, "-x", "ds", "-y", "value", "-o", self.output_dir, "-j", "1"]
+            + ["--format", "json", "--compression", "gzip"]
+        )
+
+        with gzip.open(os.path.join(self.output_dir, "first.json.gz")) as json_file:
+            figure = json.load(json_file)
+        self.assertEqual(figure["data"][0]["type"], "heatmap")
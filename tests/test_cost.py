@@ -0,0 +1,91 @@
+import warnings
+from typing import Callable, List
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from plotly import graph_objects as go
+
+from plotly_calplot import (
+    CostBudget,
+    calplot,
+    check_figure_cost,
+    entity_calplot,
+    get_figure_cost,
+    image_calplot,
+    month_calplot,
+    window_calplot,
+)
+from plotly_calplot.cost import FigureCostError, FigureCostWarning
+
+
+class TestCost(TestCase):
+    def setUp(self) -> None:
+        dates = pd.date_range("2021-01-01", "2022-12-31")
+        self.data = pd.DataFrame({"ds": dates, "value": np.arange(len(dates))})
+
+    def test_should_measure_calplot(self) -> None:
+        fig = calplot(self.data, x="ds", y="value")
+        cost = get_figure_cost(fig)
+
+        self.assertEqual(cost.heatmap_traces, 2)
+        self.assertEqual(cost.scatter_traces, len(fig.data) - 2)
+        self.assertEqual(cost.other_traces, 0)
+        self.assertEqual(cost.traces, len(fig.data))
+        self.assertEqual(cost.cells, len(self.data))
+        self.assertEqual(cost.subplots, 2)
+        self.assertEqual(cost.axes, 4)
+        self.assertEqual(cost.json_bytes, len(fig.to_json().encode("utf-8")))
+
+    def test_should_measure_month_calplot(self) -> None:
+        cost = get_figure_cost(month_calplot(self.data, x="ds", y="value"))
+
+        self.assertEqual((cost.heatmap_traces, cost.traces), (1, 1))
+        self.assertEqual(cost.cells, 24)
+        self.assertEqual(cost.subplots, 1)
+
+    def test_should_count_image_pixels(self) -> None:
+        png = get_figure_cost(image_calplot(self.data, "ds", "value"))
+        pixels = get_figure_cost(image_calplot(self.data, "ds", "value", hover=True))
+
+        # two years of 7 weekday rows and a separating row, 54 weeks wide
+        self.assertEqual((png.cells, pixels.cells), (15 * 54, 15 * 54))
+        self.assertEqual(png.other_traces, 1)
+
+    def test_should_check_the_budget_of_every_plot(self) -> None:
+        budget = CostBudget(max_cells=10)
+        plots: List[Callable[[], go.Figure]] = [
+            lambda: calplot(self.data, "ds", "value", cost_budget=budget),
+            lambda: month_calplot(self.data, "ds", "value", cost_budget=budget),
+            lambda: window_calplot(self.data, "ds", "value", cost_budget=budget),
+            lambda: image_calplot(self.data, "ds", "value", cost_budget=budget),
+            lambda: entity_calplot(
+                self.data.assign(host="a"), "ds", "value", "host", cost_budget=budget
+            ),
+        ]
+        for plot in plots:
+            with self.assertWarns(FigureCostWarning):
+                fig = plot()
+            self.assertEqual(
+                fig.layout.meta["cost"]["cells"], get_figure_cost(fig).cells
+            )
+
+    def test_should_warn_over_budget(self) -> None:
+        with self.assertWarnsRegex(FigureCostWarning, "cells 730 > 100"):
+            calplot(self.data, x="ds", y="value", cost_budget=CostBudget(max_cells=100))
+
+    def test_should_raise_over_budget(self) -> None:
+        budget = CostBudget(max_traces=0, max_json_bytes=10, action="raise")
+        with self.assertRaisesRegex(FigureCostError, "traces .*json_bytes"):
+            month_calplot(self.data, x="ds", y="value", cost_budget=budget)
+
+    def test_should_pass_within_budget(self) -> None:
+        fig = month_calplot(self.data, x="ds", y="value")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            cost = check_figure_cost(fig, CostBudget(max_traces=1, max_cells=24))
+        self.assertEqual(cost.cells, 24)
+
+    def test_should_reject_unknown_action(self) -> None:
+        with self.assertRaises(ValueError):
+            CostBudget(action="ignore")
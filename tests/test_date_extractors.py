@@ -4,7 +4,13 @@ from unittest import TestCase
 import numpy as np
 import pandas as pd
 
-from plotly_calplot.date_extractors import get_date_coordinates, get_month_names
+from plotly_calplot.date_extractors import (
+    get_date_coordinates,
+    get_month_names,
+    get_sparse_padding,
+    get_vectorized_date_parts,
+    get_window_coordinates,
+)
 
 
 class TestUtils(TestCase):
@@ -45,3 +51,30 @@ class TestUtils(TestCase):
         self.assertEqual(len(weeknumber_of_dates), self.sample_dataframe.shape[0])
         self.assertTrue(max(weeknumber_of_dates) <= 53)
         self.assertTrue(min(weeknumber_of_dates) >= 0)
+
+    def test_should_pad_missing_weeks_and_weekdays(self) -> None:
+        pad_weeks, pad_weekdays = get_sparse_padding([1, 3], [2, 4], [0, 1, 2, 3, 4])
+
+        self.assertEqual(pad_weeks, [0, 2, 4, 1, 1, 1, 1, 1])
+        self.assertEqual(pad_weekdays, [0, 0, 0, 0, 1, 3, 5, 6])
+
+    def test_should_get_vectorized_date_parts(self) -> None:
+        dates = pd.date_range("2018-12-25", "2021-01-10")
+
+        years, months, weekdays, weeknumbers = get_vectorized_date_parts(dates.values)
+
+        self.assertEqual(years.tolist(), dates.year.tolist())
+        self.assertEqual(months.tolist(), dates.month.tolist())
+        self.assertEqual(weekdays.tolist(), dates.weekday.tolist())
+        self.assertEqual(
+            weeknumbers.tolist(), dates.strftime("%W").astype(int).tolist()
+        )
+
+    def test_should_get_window_coordinates(self) -> None:
+        # 2020-12-30 is a Wednesday
+        days = np.arange("2020-12-30", "2021-01-12", dtype="datetime64[D]")
+
+        weekdays, week_columns = get_window_coordinates(days)
+
+        self.assertEqual(weekdays.tolist(), pd.DatetimeIndex(days).weekday.tolist())
+        self.assertEqual(week_columns.tolist(), [0] * 5 + [1] * 7 + [2])
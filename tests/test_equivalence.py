@@ -0,0 +1,134 @@
+import os
+from typing import List, Optional, Tuple
+from unittest import TestCase, skipUnless
+
+import numpy as np
+import pandas as pd
+
+from plotly_calplot.date_extractors import (
+    MONTH_NAMES,
+    get_date_coordinates,
+    get_month_names,
+    get_vectorized_date_parts,
+)
+from plotly_calplot.layout_formatter import create_month_lines, get_month_lines_path
+from plotly_calplot.utils import (
+    fill_empty_with_zeros,
+    fill_year_frame,
+    get_year_date_range,
+)
+
+FIRST_YEAR = 1900
+LAST_YEAR = 2100
+MONTH_RANGES = [(start, end) for start in range(1, 13) for end in range(start, 13)]
+EXHAUSTIVE = bool(os.environ.get("PLOTLY_CALPLOT_EXHAUSTIVE"))
+
+Segment = Tuple[float, float, float, float]
+
+
+def get_segments(xs: List[float], ys: List[float]) -> List[Segment]:
+    """
+    The non degenerate segments of a NaN separated path, each one with its
+    ends in a fixed order so the direction it is drawn in doesn't matter
+    """
+    segments = []
+    for x0, y0, x1, y1 in zip(xs[:-1], ys[:-1], xs[1:], ys[1:]):
+        if np.isnan([x0, y0, x1, y1]).any() or (x0, y0) == (x1, y1):
+            continue
+        segments.append(min((x0, y0, x1, y1), (x1, y1, x0, y0)))
+    return sorted(segments)
+
+
+def get_month_range_names(start_month: int, end_month: int) -> List[Optional[str]]:
+    """
+    What get_month_names gives for a calendar of the month range, from the
+    locale independent MONTH_NAMES the vectorized plots label months with
+    """
+    return [
+        MONTH_NAMES[m - 1] if start_month <= m <= end_month else None
+        for m in range(1, 13)
+    ]
+
+
+def get_sample_rows(
+    calendar: pd.DatetimeIndex, rng: np.random.Generator
+) -> pd.DataFrame:
+    """
+    Sorted rows on a random subset of the calendar, with some days repeated
+    """
+    days = rng.choice(calendar.values, size=max(1, len(calendar) // 3))
+    days.sort()
+    return pd.DataFrame(
+        {
+            "ds": days,
+            "value": rng.integers(0, 100, len(days)),
+            "text": [f"t{i}" for i in range(len(days))],
+        }
+    )
+
+
+class TestEquivalence(TestCase):
+    def assert_equivalent(self, year: int, start_month: int, end_month: int) -> None:
+        calendar = get_year_date_range(year, start_month, end_month)
+        frame = pd.DataFrame({"ds": calendar})
+        days = calendar.values.astype("datetime64[D]")
+        context = f"{year} {start_month}-{end_month}"
+
+        _, weekdays, weeknumbers = get_date_coordinates(frame, "ds")
+        _, _, fast_weekdays, fast_weeknumbers = get_vectorized_date_parts(days)
+        self.assertEqual(fast_weekdays.tolist(), weekdays, context)
+        self.assertEqual(fast_weeknumbers.tolist(), weeknumbers, context)
+
+        self.assertEqual(
+            get_month_range_names(start_month, end_month),
+            get_month_names(frame, "ds", start_month, end_month),
+            context,
+        )
+
+        month_lines = create_month_lines(
+            [], "#9e9e9e", 1, frame["ds"], weekdays, weeknumbers
+        )
+        reference_segments = sorted(
+            segment
+            for line in month_lines
+            for segment in get_segments(list(line.x), list(line.y))
+        )
+        xs, ys = get_month_lines_path(days, fast_weekdays, fast_weeknumbers)
+        self.assertEqual(
+            get_segments(xs.tolist(), ys.tolist()), reference_segments, context
+        )
+
+        rows = get_sample_rows(calendar, np.random.default_rng(year))
+        unique_rows = rows.drop_duplicates("ds", ignore_index=True)
+        for sample, unique in [(rows, False), (unique_rows, True)]:
+            columns = {name: sample[name].to_numpy() for name in ["value", "text"]}
+            pd.testing.assert_frame_equal(
+                fill_year_frame(
+                    sample["ds"].to_numpy().astype("datetime64[D]"),
+                    columns,
+                    "ds",
+                    year,
+                    start_month,
+                    end_month,
+                    unique=unique,
+                ),
+                fill_empty_with_zeros(sample, "ds", year, start_month, end_month),
+                obj=f"{context} unique={unique}",
+            )
+
+    def test_every_year(self) -> None:
+        for year in range(FIRST_YEAR, LAST_YEAR + 1):
+            self.assert_equivalent(year, 1, 12)
+
+    def test_every_month_range(self) -> None:
+        # 1900 isn't a leap year, 2000 is
+        for year in [1900, 2000]:
+            for start_month, end_month in MONTH_RANGES:
+                self.assert_equivalent(year, start_month, end_month)
+
+    @skipUnless(EXHAUSTIVE, "set PLOTLY_CALPLOT_EXHAUSTIVE=1 to run")
+    def test_every_month_range_of_every_year(self) -> None:
+        # takes a few minutes, run it with `make equivalence`
+        for year in range(FIRST_YEAR, LAST_YEAR + 1):
+            for start_month, end_month in MONTH_RANGES:
+                self.assert_equivalent(year, start_month, end_month)
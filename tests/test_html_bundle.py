@@ -0,0 +1,60 @@
+import json
+import os
+import re
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from plotly_calplot import calplot, figures_to_html, write_html_bundle
+from plotly_calplot.html_bundle import PLOTLYJS_FILE, get_plotlyjs_script
+
+
+class TestHtmlBundle(TestCase):
+    def setUp(self) -> None:
+        dates = pd.date_range("2021-01-01", "2021-03-31")
+        data = pd.DataFrame({"ds": dates, "value": np.arange(len(dates))})
+        self.figures = [
+            calplot(data, x="ds", y="value", title=f"</script>{i}") for i in range(3)
+        ]
+
+    def test_should_include_plotlyjs_once(self) -> None:
+        document = figures_to_html(self.figures)
+
+        self.assertEqual(document.count(get_plotlyjs_script(True)), 1)
+        self.assertEqual(document.count('class="calplot-figure"'), 3)
+
+    def test_should_inline_figures_as_parseable_json(self) -> None:
+        document = figures_to_html(self.figures, include_plotlyjs="cdn")
+        inlined = re.findall(
+            r'<script type="application/json" id="calplot-\d+-data">(.*?)</script>',
+            document,
+        )
+
+        self.assertEqual(len(inlined), 3)
+        figure = json.loads(inlined[1])
+        self.assertEqual(figure["layout"]["title"]["text"], "</script>1")
+        self.assertEqual(len(figure["data"]), len(self.figures[1].data))
+
+    def test_should_write_titles_and_lazy_flag(self) -> None:
+        document = figures_to_html(
+            self.figures, titles=["a", "b", "<c>"], include_plotlyjs=False, lazy=False
+        )
+
+        self.assertIn("<h2>&lt;c&gt;</h2>", document)
+        self.assertIn("(false);", document)
+        self.assertNotIn("cdn.plot.ly", document)
+        with self.assertRaises(ValueError):
+            figures_to_html(self.figures, titles=["a"])
+
+    def test_should_write_plotlyjs_next_to_directory_bundles(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "report.html")
+            write_html_bundle(self.figures, path, include_plotlyjs="directory")
+
+            self.assertEqual(sorted(os.listdir(tmp)), [PLOTLYJS_FILE, "report.html"])
+            with open(path) as html_file:
+                self.assertIn(
+                    f'<script src="{PLOTLYJS_FILE}"></script>', html_file.read()
+                )
@@ -0,0 +1,37 @@
+import json
+import subprocess
+import sys
+from unittest import TestCase
+
+HEAVY_MODULES = ["numpy", "pandas", "plotly", "plotly.graph_objects", "plotly.subplots"]
+
+IMPORT_PROBE = """
+import json
+import sys
+
+import plotly_calplot
+print(json.dumps({"modules": sorted(sys.modules)}))
+"""
+
+
+class TestImport(TestCase):
+    def setUp(self) -> None:
+        # a fresh interpreter is needed, the test session already loaded everything
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        self.probe = json.loads(output)
+
+    def test_should_not_load_heavy_modules_on_import(self) -> None:
+        loaded = set(self.probe["modules"])
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, loaded)
+
+    def test_should_resolve_public_functions(self) -> None:
+        import plotly_calplot
+
+        self.assertTrue(callable(plotly_calplot.calplot))
+        self.assertTrue(callable(plotly_calplot.month_calplot))
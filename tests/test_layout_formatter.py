@@ -1,12 +1,19 @@
 from datetime import datetime
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
 from plotly import graph_objects as go
+from plotly.subplots import make_subplots
 
 from plotly_calplot.layout_formatter import (
+    add_year_payloads,
+    apply_coloraxis,
+    apply_shared_layout,
     create_month_lines,
+    create_month_lines_trace,
     decide_layout,
+    get_month_lines_path,
     update_plot_with_current_layout,
 )
 
@@ -86,7 +93,9 @@ class TestLayouting(TestCase):
                 },
             }
         )
-        result = update_plot_with_current_layout(go.Figure(), [], 0, layout, 100, False)
+        result = update_plot_with_current_layout(go.Figure(), [], 0, layout, False)
+        result = apply_shared_layout(result, layout, 100)
+        self.assertEqual(result.layout.height, 100)
         self.assertEqual(result.layout.font, layout.font)
         self.assertEqual(result.layout.margin, layout.margin)
         self.assertEqual(result.layout.plot_bgcolor, layout.plot_bgcolor)
@@ -95,3 +104,73 @@ class TestLayouting(TestCase):
         self.assertEqual(result.layout.xaxis, layout.xaxis)
         self.assertEqual(result.layout.yaxis, layout.yaxis)
         self.assertTrue(type(result) == go.Figure)
+
+    def test_should_update_only_the_current_year_axes(self) -> None:
+        layout = decide_layout(False, "title", ["January"], [1.5])
+        fig = make_subplots(rows=3, cols=1)
+
+        result = update_plot_with_current_layout(fig, [], 1, layout, False)
+
+        self.assertEqual(result.layout.xaxis2.ticktext, ("January",))
+        self.assertEqual(result.layout.yaxis2.autorange, "reversed")
+        self.assertIsNone(result.layout.xaxis.ticktext)
+        self.assertIsNone(result.layout.xaxis3.ticktext)
+
+    def test_should_apply_shared_layout_without_axes(self) -> None:
+        layout = decide_layout(True, "title", ["January"], [1.5])
+        fig = make_subplots(rows=2, cols=1)
+
+        result = apply_shared_layout(fig, layout, 300)
+
+        self.assertEqual(result.layout.height, 300)
+        self.assertEqual(result.layout.paper_bgcolor, "#333")
+        self.assertIsNone(result.layout.xaxis.ticktext)
+
+    def test_should_get_month_lines_path(self) -> None:
+        dates = pd.date_range("2019-01-01", "2019-12-31")
+        weekdays = np.array(dates.weekday)
+        weeknumbers = np.array(dates.strftime("%W").astype(int))
+
+        xs, ys = get_month_lines_path(
+            dates.values.astype("datetime64[D]"), weekdays, weeknumbers, [0, 8]
+        )
+        segments = create_month_lines(
+            [], "#333", 1, pd.Series(dates), weekdays.tolist(), weeknumbers.tolist()
+        )
+        segment_points = {(x, y) for s in segments for x, y in zip(s["x"], s["y"])}
+        first_xs, second_ys = np.split(xs, 2)[0], np.split(ys, 2)[1]
+        path_points = {(x, y) for x, y in zip(first_xs, ys) if x == x}
+
+        self.assertEqual(len(xs), 2 * 12 * 5)
+        self.assertEqual(path_points, segment_points)
+        self.assertEqual(np.nanmin(second_ys), 7.5)
+
+    def test_should_create_month_lines_trace(self) -> None:
+        trace = create_month_lines_trace("#333", 2, np.array([0.5]), np.array([1.5]))
+
+        self.assertEqual(trace.mode, "lines")
+        self.assertEqual(trace.line.width, 2)
+        self.assertEqual(trace.hoverinfo, "skip")
+
+    def test_should_apply_coloraxis(self) -> None:
+        fig = apply_coloraxis(go.Figure(), "greens", 1, 5, False)
+
+        self.assertEqual(fig.layout.coloraxis.cmin, 1)
+        self.assertEqual(fig.layout.coloraxis.cmax, 5)
+        self.assertFalse(fig.layout.coloraxis.showscale)
+        self.assertEqual(fig.layout.coloraxis.colorscale[0][1], "rgb(247,252,245)")
+
+    def test_should_add_year_payloads_at_once(self) -> None:
+        layout = decide_layout(False, "title", ["January"], [1.5])
+        axes = {"xaxis": layout.xaxis.to_plotly_json(), "yaxis": {}}
+        fig = make_subplots(rows=2, cols=1)
+
+        result = add_year_payloads(
+            fig, [([{"type": "heatmap"}], {"xaxis": {}, "yaxis": {}}), ([{}], axes)]
+        )
+
+        self.assertEqual(len(result.data), 2)
+        self.assertEqual(result.data[0].xaxis, "x")
+        self.assertEqual(result.data[1].yaxis, "y2")
+        self.assertEqual(result.layout.xaxis2.ticktext, ("January",))
+        self.assertIsNone(result.layout.xaxis.ticktext)
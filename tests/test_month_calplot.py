@@ -1,6 +1,7 @@
 from datetime import datetime
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
 from plotly import graph_objects as go
 
@@ -67,3 +68,24 @@ class TestMonthCalplot(TestCase):
         self.assertIsInstance(cp, go.Figure)
         self.assertIsInstance(cp.data, tuple)
         self.assertEqual(cp.layout["paper_bgcolor"], "#333")
+
+    def test_should_create_one_row_per_group(self) -> None:
+        data = pd.DataFrame(
+            {
+                "ds": pd.to_datetime(
+                    ["2021-01-05", "2021-01-09", "2021-03-01", "2022-01-01"]
+                ),
+                "value": [1, 2, 3, 4],
+                "group": ["b", "a", "b", "a"],
+            }
+        )
+        cp = month_calplot(data, "ds", "value", group="group")
+
+        self.assertEqual(len(cp.data), 1)
+        self.assertEqual(cp.data[0].y, ("a", "b"))
+        self.assertEqual(len(cp.data[0].x), 13)
+        self.assertEqual((cp.data[0].x[0], cp.data[0].x[-1]), ("Jan 2021", "Jan 2022"))
+        self.assertEqual(cp.data[0].z[0][0], 2)
+        self.assertEqual(cp.data[0].z[1][2], 3)
+        self.assertTrue(np.isnan(cp.data[0].z[1][1]))
+        self.assertEqual(cp.layout.height, 80)
@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from plotly_calplot import calplot, prepare_calplot
+
+
+class TestPaging(TestCase):
+    def setUp(self) -> None:
+        dates = pd.date_range("2019-01-01", "2023-12-31", freq="3D")
+        self.data = pd.DataFrame({"ds": dates, "value": np.arange(len(dates))})
+        self.prepared = prepare_calplot(self.data.copy(), "ds", "value")
+
+    def test_should_prepare_every_year(self) -> None:
+        self.assertEqual(self.prepared.years, [2019, 2020, 2021, 2022, 2023])
+        self.assertEqual(self.prepared.n_pages(2), 3)
+        self.assertEqual(self.prepared.value_max, len(self.data) - 1)
+
+    def test_should_page_from_the_most_recent_years(self) -> None:
+        first_page = self.prepared.page(0, n_years=2)
+        last_page = self.prepared.page(2, n_years=2)
+
+        self.assertEqual(first_page.layout.height, 300)
+        self.assertEqual(last_page.layout.height, 150)
+        self.assertEqual(str(first_page.data[0].customdata[0][0]), "2022-01-01")
+        self.assertEqual(str(last_page.data[0].customdata[0][0]), "2019-01-01")
+        with self.assertRaises(IndexError):
+            self.prepared.page(3, n_years=2)
+
+    def test_should_share_the_colorscale_across_pages(self) -> None:
+        page = self.prepared.page(2, n_years=2)
+
+        self.assertEqual(page.layout.coloraxis.cmin, 0)
+        self.assertEqual(page.layout.coloraxis.cmax, len(self.data) - 1)
+
+    def test_should_draw_a_window_like_calplot(self) -> None:
+        window = self.prepared.window(2020, 2021, dark_theme=True, gap=2)
+        data = self.data[self.data["ds"].dt.year.isin([2020, 2021])].copy()
+        expected = calplot(
+            data,
+            "ds",
+            "value",
+            dark_theme=True,
+            gap=2,
+            cmap_min=0,
+            cmap_max=len(self.data) - 1,
+        )
+
+        self.assertEqual(window.to_json(), expected.to_json())
+        with self.assertRaises(IndexError):
+            self.prepared.window(2030, 2031)
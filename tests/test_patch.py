@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from plotly import graph_objects as go
+
+from plotly_calplot import calplot, get_figure_patch, month_calplot
+
+
+class TestPatch(TestCase):
+    def setUp(self) -> None:
+        self.data = pd.DataFrame(
+            {"ds": pd.date_range("2021-01-01", "2022-12-31"), "value": np.arange(730.0)}
+        )
+
+    def test_should_patch_only_the_changed_cells(self) -> None:
+        old = calplot(self.data.copy(), "ds", "value")
+        changed = self.data.copy()
+        changed.loc[5, "value"] = 1000
+        changed.loc[400, "value"] = 3
+        new = calplot(changed, "ds", "value", dark_theme=True)
+
+        patch = get_figure_patch(old, new)
+
+        assert patch is not None
+        self.assertEqual(
+            patch["restyle"], [[{"z[5]": 1000.0}, [0]], [{"z[35]": 3.0}, [31]]]
+        )
+        self.assertEqual(patch["relayout"]["coloraxis.cmax"], 1000.0)
+        self.assertEqual(patch["relayout"]["font.color"], "#fff")
+
+    def test_should_share_calls_and_send_whole_arrays(self) -> None:
+        old = go.Figure([go.Heatmap(z=[1, 2, 3]), go.Heatmap(z=[4, 5, 6])])
+        new = go.Figure(
+            [go.Heatmap(z=[7, 8, 3], zmax=9), go.Heatmap(z=[4, 5, 6], zmax=9)]
+        )
+
+        patch = get_figure_patch(old, new)
+
+        assert patch is not None
+        self.assertEqual(
+            patch["restyle"], [[{"z": [[7, 8, 3]], "zmax": 9}, [0]], [{"zmax": 9}, [1]]]
+        )
+        self.assertEqual(patch["relayout"], {})
+
+    def test_should_return_none_when_traces_differ(self) -> None:
+        old = calplot(self.data.copy(), "ds", "value")
+        new = month_calplot(self.data.copy(), "ds", "value")
+
+        self.assertIsNone(get_figure_patch(old, new))
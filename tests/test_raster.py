@@ -0,0 +1,113 @@
+import base64
+from datetime import datetime
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from plotly_calplot.raster import (
+    encode_png,
+    get_colorscale_lut,
+    get_hovertext,
+    map_values_to_rgba,
+    rasterize_calendar,
+)
+
+
+class TestRaster(TestCase):
+    def setUp(self) -> None:
+        self.sample_dataframe = pd.DataFrame(
+            [
+                (datetime(2019, 1, 1), 13),
+                (datetime(2019, 1, 3), 5),
+                (datetime(2019, 3, 31), 2),
+                (datetime(2020, 4, 1), 27),
+            ],
+            columns=["ds", "value"],
+        )
+
+    def test_should_sample_colorscale(self) -> None:
+        lut = get_colorscale_lut("greens")
+
+        self.assertEqual(lut.shape, (256, 4))
+        self.assertEqual(lut.dtype, np.uint8)
+        self.assertEqual(lut[0].tolist(), [247, 252, 245, 255])
+        self.assertEqual(lut[-1].tolist(), [0, 68, 27, 255])
+
+    def test_should_sample_custom_colorscale(self) -> None:
+        lut = get_colorscale_lut([[0, "#000000"], [1, "#ffffff"]], size=3)
+
+        self.assertEqual(lut[:, 0].tolist(), [0, 128, 255])
+
+    def test_should_sample_colorscales_in_every_plotly_form(self) -> None:
+        named = get_colorscale_lut([[0, "red"], [1, "Blue"]], size=2)
+        listed = get_colorscale_lut(["red", "blue"], size=2)
+        short_hex = get_colorscale_lut(["#f00", "#00f"], size=2)
+        rgb = get_colorscale_lut(["rgb(255, 0, 0)", "rgb(0%, 0%, 100%)"], size=2)
+
+        for lut in [named, listed, short_hex, rgb]:
+            self.assertEqual(lut.tolist(), [[255, 0, 0, 255], [0, 0, 255, 255]])
+
+    def test_should_keep_the_opacity_of_colors(self) -> None:
+        lut = get_colorscale_lut(["rgba(0, 0, 255, 0.5)", "rgba(255, 0, 0, 0)"], size=2)
+
+        self.assertEqual(lut.tolist(), [[0, 0, 255, 128], [255, 0, 0, 0]])
+
+    def test_should_reject_unreadable_colorscales(self) -> None:
+        with self.assertRaises(ValueError):
+            get_colorscale_lut("not a colorscale")
+        with self.assertRaisesRegex(ValueError, "hsl"):
+            get_colorscale_lut(["hsl(0, 100%, 50%)", "red"])
+
+    def test_should_map_values_with_cmap_limits(self) -> None:
+        lut = get_colorscale_lut([[0, "#000000"], [1, "#ffffff"]], size=3)
+        values = np.array([[-5.0, 5.0, 50.0, np.nan]])
+
+        rgba = map_values_to_rgba(values, lut, 0, 10)
+
+        self.assertEqual(rgba[0, :, 0].tolist(), [0, 128, 255, 0])
+        self.assertEqual(rgba[0, :, 3].tolist(), [255, 255, 255, 0])
+
+    def test_should_rasterize_on_week_grid(self) -> None:
+        value_grid, date_grid, years = rasterize_calendar(
+            self.sample_dataframe["ds"].to_numpy(),
+            self.sample_dataframe["value"].to_numpy(),
+        )
+
+        self.assertEqual(years, [2019, 2020])
+        self.assertEqual(value_grid.shape, (15, 54))
+        # 2019-01-01 is a Tuesday on week 0, 2020-04-01 a Wednesday on week 13
+        self.assertEqual(value_grid[1, 0], 13)
+        self.assertEqual(value_grid[8 + 2, 13], 27)
+        self.assertEqual(np.isfinite(value_grid).sum(), 4)
+        self.assertEqual(str(date_grid[1, 0]), "2019-01-01")
+
+    def test_should_rasterize_month_range(self) -> None:
+        value_grid, _, years = rasterize_calendar(
+            self.sample_dataframe["ds"].to_numpy(),
+            self.sample_dataframe["value"].to_numpy(),
+            start_month=3,
+            end_month=4,
+        )
+
+        self.assertEqual(years, [2019, 2020])
+        self.assertEqual(np.isfinite(value_grid).sum(), 2)
+
+    def test_should_create_hovertext(self) -> None:
+        value_grid, date_grid, _ = rasterize_calendar(
+            self.sample_dataframe["ds"].to_numpy(),
+            self.sample_dataframe["value"].to_numpy(),
+        )
+
+        hovertext = get_hovertext(value_grid, date_grid, "y")
+
+        self.assertEqual(hovertext[1, 0], "2019-01-01 <br>y=13.0")
+        self.assertEqual(hovertext[0, 0], "")
+
+    def test_should_encode_png(self) -> None:
+        uri = encode_png(np.zeros((3, 2, 4), dtype=np.uint8))
+        png = base64.b64decode(uri.split(",")[1])
+
+        self.assertTrue(uri.startswith("data:image/png;base64,"))
+        self.assertEqual(png[:8], b"\x89PNG\r\n\x1a\n")
+        self.assertEqual(png[12:16], b"IHDR")
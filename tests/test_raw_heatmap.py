@@ -4,7 +4,10 @@ from unittest.mock import MagicMock, patch
 
 import pandas as pd
 
-from plotly_calplot.raw_heatmap import create_heatmap_without_formatting
+from plotly_calplot.raw_heatmap import (
+    create_background_heatmap,
+    create_heatmap_without_formatting,
+)
 
 
 class TestRawHeatmap(TestCase):
@@ -43,3 +46,13 @@ class TestRawHeatmap(TestCase):
         )
         hm_mock.Heatmap.assert_called()
         self.assertTrue(type(hm), list)
+
+    def test_should_create_background_heatmap(self) -> None:
+        hm = create_background_heatmap(
+            self.weeknumber_of_dates, self.weekdays_in_year, 1, False
+        )
+
+        self.assertEqual(hm.name, "background")
+        self.assertEqual(hm.hoverinfo, "skip")
+        self.assertEqual(len(hm.z), 7)
+        self.assertEqual(len(hm.z[0]), 22)
@@ -0,0 +1,191 @@
+import gzip
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from plotly import graph_objects as go
+
+import plotly_calplot
+from plotly_calplot import calplot, get_input_hash, to_canonical_json
+from plotly_calplot.serialization import to_json_bytes, write_figure_json
+
+try:
+    import brotli
+
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+
+class TestSerialization(TestCase):
+    def setUp(self) -> None:
+        dates = pd.date_range("2021-01-01", "2021-12-31")
+        self.data = pd.DataFrame(
+            {
+                "ds": dates,
+                "value": np.linspace(0, 1, len(dates)),
+                "text": [f"t{i}" for i in range(len(dates))],
+            }
+        )
+
+    def test_should_serialize_identical_figures_identically(self) -> None:
+        first = calplot(self.data.copy(), "ds", "value", text="text")
+        second = calplot(self.data.copy(), "ds", "value", text="text")
+
+        self.assertEqual(to_canonical_json(first), to_canonical_json(second))
+
+    def test_should_not_depend_on_update_order(self) -> None:
+        first = go.Figure(go.Heatmap(z=[1.5, np.nan], uid="a"))
+        first.update_layout(height=100).update_layout(title="t")
+        second = go.Figure(go.Heatmap(z=[1.5, np.nan], uid="b"))
+        second.update_layout(title="t").update_layout(height=100)
+
+        canonical = to_canonical_json(first)
+        self.assertEqual(canonical, to_canonical_json(second))
+        self.assertEqual(json.loads(canonical)["data"][0]["z"], [1.5, None])
+        self.assertNotIn(" ", canonical)
+        self.assertNotIn("uid", json.loads(canonical)["data"][0])
+        # the figure itself keeps its uids
+        self.assertEqual(first.data[0].uid, "a")
+
+    def test_should_hash_the_inputs(self) -> None:
+        digest = get_input_hash(self.data, "ds", "value", kind="calplot")
+
+        self.assertEqual(
+            digest, get_input_hash(self.data.copy(), "ds", "value", kind="calplot")
+        )
+        # columns the plot doesn't read don't matter unless they are named
+        self.assertEqual(
+            digest,
+            get_input_hash(self.data.assign(text="x"), "ds", "value", kind="calplot"),
+        )
+        self.assertNotEqual(
+            digest,
+            get_input_hash(self.data, "ds", "value", kind="calplot", text="text"),
+        )
+        self.assertNotEqual(
+            digest, get_input_hash(self.data, "ds", "value", kind="month_calplot")
+        )
+        changed = self.data.copy()
+        changed.loc[10, "value"] = 2
+        self.assertNotEqual(
+            digest, get_input_hash(changed, "ds", "value", kind="calplot")
+        )
+
+    def test_should_hash_the_released_version(self) -> None:
+        pyproject = os.path.join(os.path.dirname(__file__), "..", "pyproject.toml")
+        with open(pyproject) as pyproject_file:
+            match = re.search(r'^version = "(.+)"', pyproject_file.read(), re.M)
+
+        assert match is not None
+        self.assertEqual(plotly_calplot.__version__, match.group(1))
+        digest = get_input_hash(self.data, "ds", "value")
+        with patch(
+            "plotly_calplot.serialization._get_package_version", return_value="9.9.9"
+        ):
+            self.assertNotEqual(digest, get_input_hash(self.data, "ds", "value"))
+
+    def test_should_hash_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.csv")
+            self.data.to_csv(path, index=False)
+            digest = get_input_hash(path, "ds", "value")
+            self.assertEqual(digest, get_input_hash(path, "ds", "value"))
+
+            self.data.head(10).to_csv(path, index=False)
+            self.assertNotEqual(digest, get_input_hash(path, "ds", "value"))
+
+    def test_should_hash_series_and_array_pairs(self) -> None:
+        series = self.data.set_index("ds")["value"]
+        digest = get_input_hash(series, "ds", "value")
+
+        self.assertEqual(digest, get_input_hash(series.copy(), "ds", "value"))
+        self.assertNotEqual(digest, get_input_hash(series * 2, "ds", "value"))
+        self.assertNotEqual(
+            digest, get_input_hash(series.shift(1, freq="D"), "ds", "value")
+        )
+        pair = (self.data["ds"].to_numpy(), self.data["value"].to_numpy())
+        self.assertEqual(
+            get_input_hash(pair, "ds", "value"),
+            get_input_hash((pair[0].copy(), pair[1].copy()), "ds", "value"),
+        )
+        self.assertNotEqual(
+            get_input_hash(pair, "ds", "value"),
+            get_input_hash((pair[0], pair[1] + 1), "ds", "value"),
+        )
+
+    def test_should_reject_chunk_iterables(self) -> None:
+        with self.assertRaises(TypeError):
+            get_input_hash(iter([self.data]), "ds", "value")
+
+    def test_should_encode_the_canonical_json_document(self) -> None:
+        fig = calplot(self.data.copy(), "ds", "value", text="text")
+
+        self.assertEqual(
+            json.loads(to_json_bytes(fig)), json.loads(to_canonical_json(fig))
+        )
+
+    def test_should_write_the_same_bytes_without_orjson(self) -> None:
+        fig = calplot(self.data.assign(value=self.data["value"] * 1e16), "ds", "value")
+        with_orjson, without_orjson, fast = io.BytesIO(), io.BytesIO(), io.BytesIO()
+        write_figure_json(fig, with_orjson)
+        with patch.dict(sys.modules, {"orjson": None}):
+            write_figure_json(fig, without_orjson)
+        write_figure_json(fig, fast, fast=True)
+
+        self.assertEqual(with_orjson.getvalue(), without_orjson.getvalue())
+        self.assertEqual(
+            json.loads(fast.getvalue()), json.loads(with_orjson.getvalue())
+        )
+
+    def test_should_write_one_trace_at_a_time(self) -> None:
+        from _plotly_utils.utils import PlotlyJSONEncoder
+
+        fig = go.Figure([go.Heatmap(z=[1.5, np.nan]), go.Heatmap(z=[np.inf, 2])])
+        output = io.BytesIO()
+        with patch.object(output, "write", wraps=output.write) as write:
+            write_figure_json(fig, output)
+
+        self.assertGreater(write.call_count, len(fig.data))
+        document = json.dumps(
+            fig.to_plotly_json(),
+            cls=PlotlyJSONEncoder,
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        self.assertEqual(output.getvalue(), document.encode())
+
+    def test_should_write_gzip_deterministically(self) -> None:
+        fig = calplot(self.data.copy(), "ds", "value")
+        first, second = io.BytesIO(), io.BytesIO()
+        write_figure_json(fig, first, "gzip")
+        write_figure_json(fig, second, "gzip")
+
+        self.assertEqual(first.getvalue(), second.getvalue())
+        self.assertEqual(
+            gzip.decompress(first.getvalue()), to_canonical_json(fig).encode()
+        )
+
+    def test_should_write_brotli(self) -> None:
+        fig = calplot(self.data.copy(), "ds", "value")
+        output = io.BytesIO()
+        if not HAS_BROTLI:
+            with self.assertRaises(ImportError):
+                write_figure_json(fig, output, "brotli")
+            return
+        write_figure_json(fig, output, "brotli")
+        self.assertEqual(
+            brotli.decompress(output.getvalue()), to_canonical_json(fig).encode()
+        )
+
+    def test_should_reject_unknown_compression(self) -> None:
+        fig = calplot(self.data.copy(), "ds", "value")
+        with self.assertRaises(ValueError):
+            write_figure_json(fig, io.BytesIO(), "zip")
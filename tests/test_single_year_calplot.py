@@ -5,7 +5,7 @@ import pandas as pd
 from plotly import graph_objects as go
 from plotly.subplots import make_subplots
 
-from plotly_calplot.single_year_calplot import year_calplot
+from plotly_calplot.single_year_calplot import get_year_traces, year_calplot
 
 
 class TestSingleYearCalplot(TestCase):
@@ -31,3 +31,9 @@ class TestSingleYearCalplot(TestCase):
         cp = year_calplot(self.sample_dataframe, "ds", "value", fig, 0, 2019)
 
         self.assertTrue(type(cp) == go.Figure)
+
+    def test_should_get_year_traces_without_figure(self) -> None:
+        cplt, layout = get_year_traces(self.sample_dataframe, "ds", "value", 2019)
+
+        self.assertEqual(cplt[0].type, "heatmap")
+        self.assertEqual(layout.xaxis.ticktext[0], "January")
@@ -0,0 +1,169 @@
+import multiprocessing
+import os
+import tempfile
+from typing import List, Tuple
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from plotly_calplot import DailyStore, calplot
+
+
+def add_events(task: Tuple[str, int]) -> None:
+    path, day = task
+    DailyStore(path).add("a", [f"2022-01-{day:02d}"], [1])
+
+
+def add_and_crash(path: str) -> None:
+    # the process dies after writing the cells, before the write is committed
+    with patch.object(DailyStore, "_swap_meta", lambda *args: os._exit(1)):
+        DailyStore(path).add("a", ["2022-01-01", "2022-01-03"], [100, 100])
+
+
+class TestDailyStore(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "store")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_should_add_events_to_daily_totals(self) -> None:
+        store = DailyStore(self.path)
+        store.add("a", ["2022-01-01", "2022-01-01", "2022-01-03"], [1, 2, 3])
+        store.add("a", ["2022-01-03"], [4])
+
+        self.assertEqual(store.series, ["a"])
+        self.assertEqual(str(store.days[0]), "2022-01-01")
+        np.testing.assert_array_equal(store.values, [[3, np.nan, 7]])
+
+    def test_should_grow_days_and_series(self) -> None:
+        store = DailyStore(self.path)
+        store.add("a", ["2022-01-02"], [1])
+        store.upsert("b", ["2021-12-31", "2022-01-04"], [5, 6])
+
+        self.assertEqual(store.series, ["a", "b"])
+        self.assertEqual(store.values.shape, (2, 5))
+        np.testing.assert_array_equal(
+            store.values[0], [np.nan, np.nan, 1, np.nan, np.nan]
+        )
+        np.testing.assert_array_equal(store.values[1], [5, np.nan, np.nan, np.nan, 6])
+
+    def test_should_upsert_replacing_values(self) -> None:
+        store = DailyStore(self.path)
+        store.add("a", ["2022-01-01", "2022-01-02"], [1, 2])
+        store.upsert("a", ["2022-01-02", "2022-01-02"], [8, 9])
+
+        np.testing.assert_array_equal(store.values, [[1, 9]])
+
+    def values_files(self) -> List[str]:
+        return [name for name in os.listdir(self.path) if name.startswith("values")]
+
+    def test_should_write_in_place_while_there_is_room(self) -> None:
+        store = DailyStore(self.path)
+        store.add("a", ["2022-01-01"], [1])
+        values_files = self.values_files()
+        store.add("a", ["2022-06-01"], [1])
+        store.upsert("b", ["2022-01-02"], [1])
+
+        self.assertEqual(len(values_files), 2)
+        self.assertEqual(self.values_files(), values_files)
+        self.assertEqual(store.values.shape, (2, 152))
+
+    def test_should_keep_one_values_file_when_growing(self) -> None:
+        store = DailyStore(self.path)
+        store.add("a", ["2022-01-01"], [1])
+        values_files = self.values_files()
+        store.add("a", ["2024-01-01", "2019-01-01"], [2, 3])
+
+        # both buffers are replaced
+        self.assertEqual(len(self.values_files()), 2)
+        self.assertFalse(set(self.values_files()) & set(values_files))
+        self.assertEqual(str(store.days[0]), "2019-01-01")
+        self.assertEqual(np.nansum(store.values), 6)
+
+    def test_should_share_data_with_readonly_readers(self) -> None:
+        writer = DailyStore(self.path)
+        writer.add("a", ["2022-01-01", "2022-01-02"], [1, 2])
+        reader = DailyStore(self.path, readonly=True)
+        mapped = reader.values
+
+        writer.add("a", ["2022-01-01", "2022-01-02"], [10, 20])
+
+        # a write is never seen in part, the mapped version is left as it was
+        np.testing.assert_array_equal(mapped, [[1, 2]])
+        reader.refresh()
+        np.testing.assert_array_equal(reader.values, [[11, 22]])
+        with self.assertRaises(PermissionError):
+            reader.add("a", ["2022-01-01"], [1])
+
+    def test_should_leave_the_store_whole_when_a_writer_crashes(self) -> None:
+        store = DailyStore(self.path)
+        store.add("a", ["2022-01-01", "2022-01-02"], [1, 2])
+        store.add("a", ["2022-01-03"], [3])
+        context = multiprocessing.get_context("spawn")
+        crashed = context.Process(target=add_and_crash, args=(self.path,))
+        crashed.start()
+        crashed.join()
+
+        self.assertEqual(crashed.exitcode, 1)
+        reader = DailyStore(self.path, readonly=True)
+        np.testing.assert_array_equal(reader.values, [[1, 2, 3]])
+        # the next writers repair the cells the crashed one left behind
+        store.add("a", ["2022-01-03"], [1])
+        np.testing.assert_array_equal(store.values, [[1, 2, 4]])
+        store.add("a", ["2022-01-01"], [1])
+        np.testing.assert_array_equal(store.values, [[2, 2, 4]])
+        self.assertFalse(os.path.exists(os.path.join(self.path, "pending.json")))
+
+    def test_should_skip_events_without_date_or_value(self) -> None:
+        store = DailyStore(self.path)
+        store.add("a", ["2022-01-01", "2022-01-01", None], [1, np.nan, 5])
+        store.upsert("a", ["2022-01-02", None], [2, 7])
+
+        np.testing.assert_array_equal(store.values, [[1, 2]])
+        store.upsert("a", ["2022-01-02"], [np.nan])
+        np.testing.assert_array_equal(store.values, [[1, np.nan]])
+
+    def test_should_not_lose_updates_of_other_writers(self) -> None:
+        first, second = DailyStore(self.path), DailyStore(self.path)
+        first.add("a", ["2022-01-01"], [1])
+        second.add("a", ["2022-01-01"], [2])
+        first.upsert("b", ["2022-01-02"], [5])
+
+        second.refresh()
+        self.assertEqual(second.series, ["a", "b"])
+        np.testing.assert_array_equal(second.values, [[3, np.nan], [np.nan, 5]])
+
+    def test_should_serialize_writers_of_several_processes(self) -> None:
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(4) as pool:
+            pool.map(add_events, [(self.path, day) for day in range(1, 9)] * 4)
+
+        store = DailyStore(self.path, readonly=True)
+        np.testing.assert_array_equal(store.values, [[4] * 8])
+
+    def test_should_give_up_refreshing_a_missing_values_file(self) -> None:
+        store = DailyStore(self.path)
+        store.add("a", ["2022-01-01"], [1])
+        for name in self.values_files():
+            os.remove(os.path.join(self.path, name))
+
+        with patch("plotly_calplot.store.REFRESH_BACKOFF", 0):
+            with self.assertRaises(TimeoutError):
+                store.refresh()
+
+    def test_should_not_open_missing_store_as_readonly(self) -> None:
+        with self.assertRaises(FileNotFoundError):
+            DailyStore(self.path, readonly=True)
+
+    def test_should_feed_calplot_without_copying(self) -> None:
+        store = DailyStore(self.path)
+        store.add("a", ["2019-01-01", "2019-03-31", "2019-05-30"], [13, 2, 0])
+
+        frame = store.frame("a", "ds", "value")
+        cp = calplot(frame, "ds", "value")
+
+        self.assertTrue(np.shares_memory(frame["value"].to_numpy(), store.values))
+        self.assertEqual(cp.data[0].z[0], 13)
@@ -0,0 +1,119 @@
+import os
+import tempfile
+from datetime import datetime
+from typing import List
+from unittest import TestCase, skipUnless
+
+import numpy as np
+import pandas as pd
+from plotly import graph_objects as go
+
+from plotly_calplot import calplot, month_calplot
+from plotly_calplot.streaming import (
+    DailyAggregator,
+    aggregate_daily,
+    as_frame,
+    read_chunks,
+)
+
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+class TestStreaming(TestCase):
+    def setUp(self) -> None:
+        self.sample_dataframe = pd.DataFrame(
+            [
+                (datetime(2019, 1, 1), 13),
+                (datetime(2019, 1, 1), 16),
+                (datetime(2019, 1, 3), 5),
+                (datetime(2019, 3, 31), 2),
+                (datetime(2019, 4, 1), 27),
+                (datetime(2020, 4, 2), 29),
+                (datetime(2018, 4, 3), 20),
+                (datetime(2019, 4, 4), np.nan),
+            ],
+            columns=["ds", "value"],
+        )
+        self.expected = (
+            self.sample_dataframe.dropna().groupby("ds")["value"].sum().reset_index()
+        )
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def chunks(self, size: int = 3) -> List[pd.DataFrame]:
+        return [
+            self.sample_dataframe.iloc[i : i + size]  # noqa: E203
+            for i in range(0, len(self.sample_dataframe), size)
+        ]
+
+    def test_should_aggregate_growing_in_both_directions(self) -> None:
+        aggregator = DailyAggregator()
+        for chunk in self.chunks():
+            aggregator.add(
+                chunk["ds"].to_numpy().astype("datetime64[D]"),
+                chunk["value"].to_numpy(dtype=float),
+            )
+
+        result = aggregator.to_frame("ds", "value")
+
+        pd.testing.assert_frame_equal(result, self.expected, check_dtype=False)
+
+    def test_should_aggregate_csv_in_chunks(self) -> None:
+        path = os.path.join(self.tmp_dir.name, "data.csv")
+        self.sample_dataframe.assign(other=1).to_csv(path, index=False)
+
+        self.assertEqual(len(list(read_chunks(path, ["ds", "value"], 3))), 3)
+        result = aggregate_daily(path, "ds", "value", chunksize=3)
+
+        pd.testing.assert_frame_equal(result, self.expected, check_dtype=False)
+
+    @skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_should_aggregate_parquet_in_chunks(self) -> None:
+        path = os.path.join(self.tmp_dir.name, "data.parquet")
+        self.sample_dataframe.to_parquet(path)
+
+        result = aggregate_daily(path, "ds", "value", chunksize=3)
+
+        pd.testing.assert_frame_equal(result, self.expected, check_dtype=False)
+
+    def test_should_aggregate_nullable_chunks(self) -> None:
+        for dtype in ["Int64", "Float64"]:
+            chunks = [chunk.astype({"value": dtype}) for chunk in self.chunks()]
+            self.assertIs(chunks[-1]["value"].iloc[-1], pd.NA)
+
+            result = aggregate_daily(chunks, "ds", "value")
+
+            pd.testing.assert_frame_equal(result, self.expected, check_dtype=False)
+
+    def test_should_create_calplot_from_chunks(self) -> None:
+        cp = calplot(iter(self.chunks()), "ds", "value")
+        heatmaps = [t for t in cp.data if t.type == "heatmap"]
+
+        self.assertIsInstance(cp, go.Figure)
+        self.assertEqual(len(heatmaps), 3)
+        self.assertEqual(heatmaps[1].z[0], 29)
+
+    def test_should_create_month_calplot_from_csv(self) -> None:
+        path = os.path.join(self.tmp_dir.name, "data.csv")
+        self.sample_dataframe.to_csv(path, index=False)
+
+        cp = month_calplot(path, "ds", "value", chunksize=2)
+
+        self.assertEqual(len(cp.data), 1)
+        self.assertEqual(list(cp.layout.yaxis.tickvals), [2018, 2019, 2020])
+
+    def test_should_reject_text_with_chunks(self) -> None:
+        with self.assertRaises(ValueError):
+            calplot(iter(self.chunks()), "ds", "value", text="value")
+
+    def test_should_keep_dataframes_as_they_are(self) -> None:
+        self.assertIs(
+            as_frame(self.sample_dataframe, "ds", "value"), self.sample_dataframe
+        )
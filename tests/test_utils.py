@@ -1,10 +1,21 @@
+import tracemalloc
 from datetime import datetime
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
 import pytz
 
-from plotly_calplot.utils import fill_empty_with_zeros, validate_date_column
+from plotly_calplot.utils import (
+    fill_empty_with_zeros,
+    fill_year_frame,
+    get_daily_days,
+    get_entity_day_matrix,
+    get_entity_month_matrix,
+    get_window_grid,
+    split_by_year,
+    validate_date_column,
+)
 
 
 class TestUtils(TestCase):
@@ -103,3 +114,224 @@ class TestUtils(TestCase):
         self.assertTrue(
             validate_date_column(date_column, date_fmt).dtype == "datetime64[ns]"
         )
+
+    def test_validate_date_column_non_ns_unit(self) -> None:
+        date_column = pd.Series(
+            pd.to_datetime(["2022-01-01", "2022-01-02"]).astype("datetime64[ms]")
+        )
+
+        result = validate_date_column(date_column, "%Y-%m-%d")
+
+        self.assertEqual(result.dtype, "datetime64[ns]")
+        self.assertEqual(result[1], pd.Timestamp(2022, 1, 2))
+
+    def test_validate_date_column_tz_keeps_local_day(self) -> None:
+        date_column = pd.Series(
+            pd.DatetimeIndex(["2022-01-01 23:30"], dtype="datetime64[us]").tz_localize(
+                "America/Sao_Paulo"
+            )
+        )
+
+        result = validate_date_column(date_column, "%Y-%m-%d")
+
+        self.assertEqual(result.dtype, "datetime64[ns]")
+        self.assertEqual(result[0].day, 1)
+
+    def test_validate_date_column_epoch(self) -> None:
+        date_column = pd.Series([1640995200, 1641081600])
+
+        result = validate_date_column(date_column, "%Y-%m-%d", date_unit="s")
+
+        self.assertEqual(result.dtype, "datetime64[ns]")
+        self.assertEqual(result[1], pd.Timestamp(2022, 1, 2))
+
+    def test_validate_date_column_epoch_ms(self) -> None:
+        date_column = pd.Series([1640995200000, 1641081600000])
+
+        result = validate_date_column(date_column, "%Y-%m-%d", date_unit="ms")
+
+        self.assertEqual(result[0], pd.Timestamp(2022, 1, 1))
+
+    def test_validate_date_column_string_dtype(self) -> None:
+        date_column = pd.Series(["2022-01-01", "2022-01-02"], dtype="string")
+
+        result = validate_date_column(date_column, "%Y-%m-%d")
+
+        self.assertEqual(result.dtype, "datetime64[ns]")
+
+    def test_validate_date_column_custom_format(self) -> None:
+        date_column = pd.Series(["01/02/2022", "02/02/2022"])
+
+        result = validate_date_column(date_column, "%d/%m/%Y")
+
+        self.assertEqual(result[0], pd.Timestamp(2022, 2, 1))
+
+    def test_validate_date_column_strict_iso_format(self) -> None:
+        for value in ["2023-01-05T10:00", "20230105"]:
+            with self.assertRaises(ValueError):
+                validate_date_column(pd.Series([value]), "%Y-%m-%d")
+
+    def test_validate_date_column_dedupe(self) -> None:
+        date_column = pd.Series(["2022-01-02", "2022-01-01", None, "2022-01-02"])
+
+        result = validate_date_column(date_column, "%Y-%m-%d", dedupe=True)
+        expected = validate_date_column(date_column, "%Y-%m-%d")
+
+        self.assertEqual(result.dtype, "datetime64[ns]")
+        pd.testing.assert_series_equal(result, expected)
+
+    def test_validate_date_column_dedupe_invalid_format(self) -> None:
+        date_column = pd.Series(["2022-01-01", "2022-01-01"])
+
+        with self.assertRaises(ValueError):
+            validate_date_column(date_column, "%d-%m-%Y", dedupe=True)
+
+    def test_get_entity_day_matrix(self) -> None:
+        calendar = pd.date_range("2022-01-01", "2022-01-10")
+        days = np.array(
+            ["2022-01-01", "2022-01-03", "2022-01-03", "2021-12-31", "NaT"],
+            dtype="datetime64[D]",
+        )
+
+        matrix = get_entity_day_matrix(
+            np.array([0, 1, 1, 0, 0]),
+            days,
+            np.array([1.0, 2.0, 3.0, 4.0, 5.0]),
+            2,
+            calendar,
+        )
+
+        self.assertEqual(matrix.shape, (2, 10))
+        self.assertEqual(matrix[0, 0], 1)
+        self.assertEqual(matrix[1, 2], 3)
+        self.assertEqual(np.isfinite(matrix).sum(), 2)
+
+    def test_get_entity_month_matrix(self) -> None:
+        months = np.array(
+            ["2019-11", "2020-01", "2020-01", "NaT", "2019-12", "2020-01"],
+            dtype="datetime64[M]",
+        )
+        matrix, month_range = get_entity_month_matrix(
+            np.array([0, 1, 1, 0, -1, 0]),
+            months,
+            np.array([1.0, 2.0, 3.0, 4.0, 5.0, np.nan]),
+            2,
+        )
+
+        np.testing.assert_array_equal(
+            month_range, np.array(["2019-11", "2019-12", "2020-01"], "datetime64[M]")
+        )
+        np.testing.assert_array_equal(
+            matrix, np.array([[1.0, np.nan, np.nan], [np.nan, np.nan, 5.0]])
+        )
+
+    def test_split_by_year(self) -> None:
+        dates = pd.Series(
+            pd.to_datetime(
+                ["2021-05-03", "2019-01-01", "2019-12-31", "NaT", "2019-06-01"]
+            )
+        )
+
+        days, order, year_slices = split_by_year(dates, 3, 6)
+
+        # unsorted dates come with the order that sorts them
+        assert order is not None
+        self.assertEqual(order.tolist(), [1, 4, 2, 0, 3])
+        self.assertEqual(year_slices, [(2019, slice(1, 2)), (2021, slice(3, 4))])
+        self.assertEqual(str(days[year_slices[0][1]][0]), "2019-06-01")
+
+    def test_split_by_year_sorted_keeps_order(self) -> None:
+        dates = pd.Series(pd.to_datetime(["2019-01-01", "2019-12-31", "2022-01-01"]))
+
+        _, order, year_slices = split_by_year(dates, 1, 12)
+
+        self.assertIsNone(order)
+        self.assertEqual([year for year, _ in year_slices], [2019, 2022])
+
+    def test_split_by_year_allocations(self) -> None:
+        rows = 200_000
+        column_bytes = 8 * rows
+        offsets = np.random.default_rng(0).integers(0, 3650, rows)
+        unsorted_dates = pd.Series(
+            pd.to_datetime(offsets, unit="D", origin="2010-01-01")
+        )
+        sorted_dates = unsorted_dates.sort_values(ignore_index=True)
+
+        for dates, allocations in [(unsorted_dates, 3), (sorted_dates, 1)]:
+            tracemalloc.start()
+            days, _, year_slices = split_by_year(dates, 2, 11)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            # the documented 8 bytes per row arrays plus the 1 byte NaT mask
+            self.assertLess(peak, (allocations + 0.25) * column_bytes)
+            for _, year_slice in year_slices:
+                self.assertTrue(np.shares_memory(days[year_slice], days))
+
+    def test_fill_year_frame_matches_fill_empty_with_zeros(self) -> None:
+        selected_year_data = pd.DataFrame(
+            {
+                "ds": [
+                    datetime(2019, 1, 5),
+                    datetime(2019, 2, 1),
+                    datetime(2019, 2, 1),
+                    datetime(2019, 3, 1),
+                ],
+                "y": [3231, 43415, 1, 23123],
+                "t": ["a", "b", "c", "d"],
+            }
+        )
+        days = selected_year_data["ds"].to_numpy().astype("datetime64[D]")
+        columns = {
+            "y": selected_year_data["y"].to_numpy(),
+            "t": selected_year_data["t"].to_numpy(),
+        }
+
+        result = fill_year_frame(days, columns, "ds", 2019, 1, 3)
+        expected = fill_empty_with_zeros(selected_year_data, "ds", 2019, 1, 3)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_fill_year_frame_unique_days(self) -> None:
+        days = np.array(["2019-01-02", "2019-03-31"], dtype="datetime64[D]")
+        columns = {"y": np.array([1, 2])}
+
+        result = fill_year_frame(days, columns, "ds", 2019, 1, 3, unique=True)
+        expected = fill_year_frame(days, columns, "ds", 2019, 1, 3)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_get_daily_days(self) -> None:
+        dates = pd.date_range("2019-01-01", periods=3).to_numpy()
+
+        days = get_daily_days(dates)
+
+        assert days is not None
+        np.testing.assert_array_equal(days, dates.astype("datetime64[D]"))
+        self.assertIsNone(get_daily_days(dates[::-1]))
+        self.assertIsNone(get_daily_days(dates[[0, 0, 1]]))
+        self.assertIsNone(get_daily_days(dates + np.timedelta64(1, "h")))
+        self.assertIsNone(get_daily_days(np.array(["2019-01-01"])))
+
+    def test_get_window_grid(self) -> None:
+        first_day = np.datetime64("2021-01-01")
+        days = np.array(
+            ["2020-12-31", "2021-01-01", "2021-01-04", "2021-01-04", "2021-01-11"],
+            dtype="datetime64[D]",
+        )
+        # 2021-01-01 is a Friday, the window holds its week and the next one
+        weekdays = np.array([4, 5, 6, 0, 1, 2, 3, 4, 5, 6])
+        week_columns = np.array([0, 0, 0, 1, 1, 1, 1, 1, 1, 1])
+
+        grid = get_window_grid(days, np.arange(5.0), first_day, weekdays, week_columns)
+
+        self.assertEqual(grid.shape, (7, 2))
+        self.assertEqual(grid[4, 0], 1)
+        # the last row of a repeated day wins, days outside are left out
+        self.assertEqual(grid[0, 1], 3)
+        self.assertEqual(np.isnan(grid).sum(), 12)
+        text = get_window_grid(
+            days, np.array(list("abcde")), first_day, weekdays, week_columns, ""
+        )
+        self.assertEqual(text[4, 0], "b")
+        self.assertEqual(text[0, 0], "")